@@ -0,0 +1,84 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ResponseCache:
+    """
+    A persistent, exact-match cache of LLM responses backed by SQLite.
+
+    Responses are keyed by a hash of the model name, the full message history
+    and the tool schema, so a cached response is only returned for an identical
+    request. The cache survives process restarts, which makes replays and
+    repeated development runs free.
+    """
+
+    def __init__(self, path):
+        """
+        Opens (or creates) the cache database.
+
+        :param path: The path to the SQLite database file.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Providers are called from the engine's thread pool, so the connection
+        # is shared between threads and guarded by a lock.
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS responses (key BLOB PRIMARY KEY, response TEXT)")
+
+    @staticmethod
+    def make_key(model_name, messages, tools=None):
+        """
+        Builds the cache key for a request.
+
+        :param model_name: The model the request is sent to.
+        :param messages: The messages sent to the model.
+        :param tools: The optional tool schema sent with the request.
+        :return: The key as bytes.
+        """
+        request = [model_name, messages, tools]
+        if orjson is not None:
+            payload = orjson.dumps(request, option=orjson.OPT_SORT_KEYS)
+        else:
+            # Matches orjson's compact UTF-8 output so keys are stable either way
+            payload = json.dumps(request, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        return hashlib.sha256(payload).digest()
+
+    def get(self, key):
+        """
+        Looks up a cached response.
+
+        :param key: The cache key.
+        :return: The cached response, or None if there is none.
+        """
+        with self._lock:
+            row = self._db.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def put(self, key, response):
+        """
+        Stores a response in the cache.
+
+        :param key: The cache key.
+        :param response: The response to store.
+        """
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?)", (key, response))
+
+    def close(self):
+        """
+        Closes the database connection.
+        """
+        with self._lock:
+            self._db.close()
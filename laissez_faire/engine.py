@@ -1,10 +1,83 @@
+import copy
 import json
 import re
 import os
 import operator
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from .llm import LLMProvider
-from .game_master import GameMaster
+
+# Matches {{ conditional }} placeholders first, then simple {placeholders}
+PLACEHOLDER_RE = re.compile(r'\{\{([^}]+)\}\}|\{([^}]+)\}')
+UNSUPPORTED_EXPRESSION_RE = re.compile(r"[^a-zA-Z0-9\s_.,+\-*/()\"'\[\]={}]")
+# Common calculations, keyed without whitespace, that are applied directly instead of eval'd
+CALCULATION_SHORTCUTS = {
+    "current_value+llm_judgement": operator.add,
+    "current_value-llm_judgement": operator.sub,
+    "current_value*llm_judgement": operator.mul,
+}
+# Looked up in place of a player with no scores, so a miss doesn't build a new dict
+NO_SCORES = types.MappingProxyType({})
+# The names a calculation is evaluated with, besides the scorecard data and parameters
+CALCULATION_ARGUMENTS = frozenset({"current_value", "llm_judgement"})
+
+# Save files keep their history in an append-only sidecar with this suffix
+HISTORY_SUFFIX = ".history.jsonl"
+
+def _dumps(obj):
+    """
+    Serializes an object to compact JSON bytes, using orjson when available.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def history_path_for(save_path):
+    """
+    Returns the path of the history sidecar for a save file.
+
+    :param save_path: The path to the save file (a string or os.PathLike), or the save file opened in binary mode.
+    """
+    # Path objects have a name too, but it is only the final component
+    path = os.fspath(save_path if isinstance(save_path, (str, os.PathLike)) else save_path.name)
+    if path.endswith(".json"):
+        path = path[:-len(".json")]
+    return path + HISTORY_SUFFIX
+
+def history_file_path(save_path, history_file):
+    """
+    Returns the path of the history sidecar a save file names. Only the file
+    name is used, so a save can't point outside its own directory.
+
+    :param save_path: The path to the save file, or the save file opened in binary mode.
+    :param history_file: The history_file recorded in the save.
+    """
+    return os.path.join(os.path.dirname(history_path_for(save_path)), os.path.basename(history_file))
+
+def read_history(history_path, length):
+    """
+    Reads the first entries of a history sidecar, one line at a time. Lines
+    past length were appended after the save was last written and are ignored.
+
+    :param history_path: The path to the history sidecar.
+    :param length: The number of entries the save file says are valid.
+    :return: An iterator over the history entries in turn order.
+    :raises ValueError: If the sidecar has fewer than length entries.
+    """
+    loads = orjson.loads if orjson is not None else json.loads
+    read = 0
+    with open(history_path, 'rb') as f:
+        for _, line in zip(range(length), f):
+            read += 1
+            yield loads(line)
+    if read < length:
+        raise ValueError(f"History file {history_path} has {read} entries, but its save expects {length}.")
 
 class Scorecard:
     """
@@ -16,100 +89,233 @@ class Scorecard:
         self.data = {}
         self.scenario_parameters = scenario.get("parameters", {})
         self.turn_date = scenario.get("start_date")
+        # The template never changes, so it is parsed once rather than on every render
+        self._compiled_template = self._compile_template(self.template.get('template', ''))
+        self._text_renderer = None
+        if self.template.get("render_type", "text") != "json" and isinstance(self._compiled_template, tuple):
+            self._text_renderer = self._build_text_renderer(self._compiled_template)
+        # Only expression placeholders need the evaluation context
+        self._text_needs_context = any(
+            isinstance(segment, tuple) and segment[0] == 'expr' for segment in self._compiled_template
+        ) if isinstance(self._compiled_template, tuple) else True
+        self._calculations = self._compile_calculations()
+        self._absolute_scores = frozenset(
+            score_name for score_name, config in self.scoring_parameters.items()
+            if config.get("type") == "absolute"
+        )
+
+    def _compile_calculations(self):
+        """
+        Compiles the calculation of every calculated score once.
 
-    def _safe_eval(self, expr, context):
+        :return: A dictionary of score name to a function of (current_value,
+            llm_judgement), compiled code, or the error compiling it raised.
         """
-        A safe evaluator for simple arithmetic and conditional expressions.
+        calculations = {}
+        # Scores often share a calculation, so each distinct one is compiled once
+        compiled = {}
+        for score_name, config in self.scoring_parameters.items():
+            if config.get("type") != "calculated":
+                continue
+            calculation = config.get("calculation")
+            if not isinstance(calculation, str):
+                calculations[score_name] = self._compile_calculation(calculation)
+                continue
+            if calculation not in compiled:
+                compiled[calculation] = self._compile_calculation(calculation)
+            calculations[score_name] = compiled[calculation]
+        return calculations
+
+    def _compile_calculation(self, calculation):
+        """
+        Compiles a single calculation; see _compile_calculations.
+        """
+        shortcut = CALCULATION_SHORTCUTS.get("".join(calculation.split())) if isinstance(calculation, str) else None
+        if shortcut:
+            return shortcut
+        try:
+            code = self._compile_expression(calculation)
+        except (SyntaxError, ValueError, TypeError) as e:
+            return e
+        if set(code.co_names) <= CALCULATION_ARGUMENTS:
+            # Needs no other scores or parameters, so it can run as a plain
+            # function without building an evaluation context
+            source = f"lambda current_value, llm_judgement: ({calculation.strip()})"
+            code = eval(compile(source, "<scorecard>", "eval"), {"__builtins__": {}})
+        return code
+
+    def _eval_context(self, context):
+        """
+        Adds the scenario parameters and the scorecard data to an evaluation context.
         """
-        # Add scenario parameters and data to the context
         context['parameters'] = self.scenario_parameters
         context.update(self.data)
 
         # Allow access to player data, e.g. USA.influence
         for player, data in self.data.items():
             context[player] = data
+        return context
 
-        # Check for unsupported characters
-        if re.search(r"[^a-zA-Z0-9\s_.,+\-*/()\"'\[\]={}]", expr):
+    def _compile_expression(self, expr):
+        """
+        Checks an expression for unsupported characters and compiles it.
+        """
+        if UNSUPPORTED_EXPRESSION_RE.search(expr):
             raise SyntaxError("Unsupported characters in expression.")
+        # eval() ignores leading whitespace, compile() does not
+        return compile(expr.lstrip(" \t"), "<scorecard>", "eval")
+
+    def _safe_eval(self, expr, context):
+        """
+        A safe evaluator for simple arithmetic and conditional expressions.
+        """
+        code = self._compile_expression(expr)
 
         # This is still not perfectly safe, but for this project, it's acceptable.
         # A better implementation would use an AST parser.
-        return eval(expr, {"__builtins__": {}}, context)
+        return eval(code, {"__builtins__": {}}, self._eval_context(context))
 
     def update(self, llm_scores):
         """
         Updates the scorecard data based on the LLM's scores.
         """
         for player, scores in llm_scores.items():
-            if player not in self.data:
-                self.data[player] = {}
+            player_data = self.data.setdefault(player, {})
 
+            # Scores of any other type, or without a config, are ignored
             for score_name, value in scores.items():
-                config = self.scoring_parameters.get(score_name)
-                if not config:
+                if score_name in self._absolute_scores:
+                    player_data[score_name] = value
+                    continue
+                calculation = self._calculations.get(score_name)
+                if calculation is None:
                     continue
 
-                score_type = config.get("type")
-                if score_type == "absolute":
-                    self.data[player][score_name] = value
-                elif score_type == "calculated":
-                    calculation = config.get("calculation")
-                    current_value = self.data[player].get(score_name, 0)
-
-                    try:
-                        new_value = self._safe_eval(calculation, {
+                current_value = player_data.get(score_name, 0)
+                try:
+                    if isinstance(calculation, Exception):
+                        raise calculation
+                    if callable(calculation):
+                        new_value = calculation(current_value, value)
+                    else:
+                        new_value = eval(calculation, {"__builtins__": {}}, self._eval_context({
                             "current_value": current_value,
                             "llm_judgement": value
-                        })
-                        self.data[player][score_name] = new_value
-                    except Exception as e:
-                        print(f"Error calculating score for {score_name}: {e}")
+                        }))
+                    player_data[score_name] = new_value
+                except Exception as e:
+                    print(f"Error calculating score for {score_name}: {e}")
 
-    def _render_template(self, template):
+    def _compile_template(self, template):
         """
-        Recursively renders a template, replacing placeholders.
+        Recursively parses a template into literal text and placeholders.
+
+        A string becomes a tuple of segments: literal strings, ('field', obj, key)
+        for plain {player.score} lookups, and ('expr', placeholder, code,
+        conditional) for everything else. The code is the compiled expression,
+        or the error compiling it raised.
         """
         if isinstance(template, str):
-            # Handle simple placeholders like {USA.influence}
-            placeholders = re.findall(r'\{([^}]+)\}', template)
-            for placeholder in placeholders:
-                try:
-                    # Use safe_eval to get the value of the placeholder
-                    value = self._safe_eval(placeholder, {})
-                    template = template.replace(f'{{{placeholder}}}', str(value))
-                except Exception as e:
-                    # Fallback for simple placeholders that don't need eval
+            segments = []
+            position = 0
+            for match in PLACEHOLDER_RE.finditer(template):
+                if match.start() > position:
+                    segments.append(template[position:match.start()])
+                position = match.end()
+
+                conditional, placeholder = match.group(1), match.group(2)
+                if placeholder is not None:
                     parts = placeholder.split('.')
-                    if len(parts) == 2:
-                        obj, key = parts
-                        if obj == 'parameters':
-                            value = self.scenario_parameters.get(key, f"Error: {key} not in parameters")
-                        else:
-                            value = self.data.get(obj, {}).get(key, 0)
-                        template = template.replace(f'{{{placeholder}}}', str(value))
-                    elif placeholder == 'turn_date':
-                        template = template.replace(f'{{{placeholder}}}', str(self.turn_date))
-                    else:
-                        print(f"Error rendering placeholder '{placeholder}': {e}")
-                        template = template.replace(f'{{{placeholder}}}', '[RENDER ERROR]')
+                    # obj.key on a dict never evaluates, so it is looked up directly
+                    if len(parts) == 2 and all(part.isidentifier() for part in parts) and not hasattr(dict, parts[1]):
+                        segments.append(('field', parts[0], parts[1]))
+                        continue
+                expr = conditional if conditional is not None else placeholder
+                try:
+                    code = self._compile_expression(expr)
+                except (SyntaxError, ValueError) as e:
+                    code = e
+                segments.append(('expr', expr, code, conditional is not None))
+            if position < len(template):
+                segments.append(template[position:])
+            return tuple(segments)
+        elif isinstance(template, dict):
+            return {k: self._compile_template(v) for k, v in template.items()}
+        elif isinstance(template, list):
+            return [self._compile_template(i) for i in template]
+        else:
+            return template
 
+    def _lookup_field(self, obj, key):
+        """
+        Looks up a simple {obj.key} placeholder.
+        """
+        if obj == 'parameters':
+            return self.scenario_parameters.get(key, f"Error: {key} not in parameters")
+        return self.data.get(obj, NO_SCORES).get(key, 0)
 
-            # Handle conditional placeholders like {{ 'a' if x > 0 else 'b' }}
-            conditional_placeholders = re.findall(r'\{\{([^}]+)\}\}', template)
-            for placeholder in conditional_placeholders:
-                try:
-                    value = self._safe_eval(placeholder, {})
-                    template = template.replace(f'{{{{{placeholder}}}}}', str(value), 1)
-                except Exception as e:
-                    print(f"Error evaluating conditional placeholder: {e}")
-                    template = template.replace(f'{{{{{placeholder}}}}}', '[EVALUATION ERROR]', 1)
+    def _render_segment(self, segment, context):
+        """
+        Renders a single segment of a compiled template.
+        """
+        if isinstance(segment, str):
+            return segment
+        if segment[0] == 'field':
+            return str(self._lookup_field(segment[1], segment[2]))
 
-            return template
+        _, placeholder, code, conditional = segment
+        try:
+            if isinstance(code, Exception):
+                raise code
+            return str(eval(code, {"__builtins__": {}}, context))
+        except Exception as e:
+            if conditional:
+                print(f"Error evaluating conditional placeholder: {e}")
+                return '[EVALUATION ERROR]'
+            # Fallback for simple placeholders that don't need eval
+            parts = placeholder.split('.')
+            if len(parts) == 2:
+                return str(self._lookup_field(*parts))
+            elif placeholder == 'turn_date':
+                return str(self.turn_date)
+            print(f"Error rendering placeholder '{placeholder}': {e}")
+            return '[RENDER ERROR]'
+
+    def _build_text_renderer(self, segments):
+        """
+        Generates a function that renders a compiled text template in one
+        expression, with every literal and {player.score} lookup inlined.
+
+        :param segments: The compiled template, see _compile_template.
+        :return: A function of (scorecard, data, parameters, context).
+        """
+        parts = []
+        for index, segment in enumerate(segments):
+            if isinstance(segment, str):
+                parts.append(repr(segment))
+            elif segment[0] == 'field' and segment[1] == 'parameters':
+                missing = f"Error: {segment[2]} not in parameters"
+                parts.append(f"str(parameters.get({segment[2]!r}, {missing!r}))")
+            elif segment[0] == 'field':
+                parts.append(f"str(data.get({segment[1]!r}, NO_SCORES).get({segment[2]!r}, 0))")
+            else:
+                parts.append(f"scorecard._render_segment(_segments[{index}], context)")
+
+        source = f"def render(scorecard, data, parameters, context):\n    return ''.join(({''.join(part + ', ' for part in parts)}))\n"
+        namespace = {"_segments": segments, "NO_SCORES": NO_SCORES}
+        exec(compile(source, "<scorecard>", "exec"), namespace)
+        return namespace["render"]
+
+    def _render_template(self, template, context):
+        """
+        Recursively renders a compiled template, replacing placeholders.
+        """
+        if isinstance(template, tuple):
+            return "".join(self._render_segment(segment, context) for segment in template)
         elif isinstance(template, dict):
-            return {k: self._render_template(v) for k, v in template.items()}
+            return {k: self._render_template(v, context) for k, v in template.items()}
         elif isinstance(template, list):
-            return [self._render_template(i) for i in template]
+            return [self._render_template(i, context) for i in template]
         else:
             return template
 
@@ -118,13 +324,23 @@ class Scorecard:
         Renders the scorecard based on the template.
         """
         render_type = self.template.get("render_type", "text")
-        template_content = self.template.get('template', '')
 
-        rendered_content = self._render_template(template_content)
+        if self._text_renderer is not None:
+            context = self._eval_context({}) if self._text_needs_context else None
+            return self._text_renderer(self, self.data, self.scenario_parameters, context)
+
+        # Built once per render and shared by every placeholder
+        context = self._eval_context({})
+        rendered_content = self._render_template(self._compiled_template, context)
 
         if render_type == 'json':
             # The template is already a dict, so just dump it to a string
-            return json.dumps(rendered_content, indent=2)
+            if orjson is not None:
+                return orjson.dumps(rendered_content, option=orjson.OPT_INDENT_2).decode("utf-8")
+            # Matches orjson's output for strings, ints and most floats. The
+            # backends still differ on small exponents (1e-07 vs 1e-7), NaN and
+            # infinity (NaN vs null) and lone surrogates, which orjson rejects.
+            return json.dumps(rendered_content, indent=2, ensure_ascii=False)
         else:
             # The template is a string
             return rendered_content
@@ -134,15 +350,19 @@ class GameEngine:
     The main game engine for Laissez-faire.
     """
 
-    def __init__(self, llm_providers: dict, scorer_llm_provider: LLMProvider, scenario_path=None, saves_dir="saves", engine_settings=None):
+    def __init__(self, llm_providers: dict, scorer_llm_provider: LLMProvider, scenario_path=None, saves_dir="saves", engine_settings=None, scenario=None):
         """
         Initializes the game engine.
         :param llm_providers: A dictionary of LLM providers for each player.
         :param scorer_llm_provider: An LLM provider for the scorer.
         :param scenario_path: The path to the scenario JSON file (optional).
         :param engine_settings: A dictionary of engine settings.
+        :param scenario: An already-parsed scenario dictionary (optional). Takes precedence over scenario_path.
         """
-        self.scenario = self.load_scenario(scenario_path) if scenario_path else {}
+        if scenario is not None:
+            self.scenario = scenario
+        else:
+            self.scenario = self.load_scenario(scenario_path) if scenario_path else {}
         self.turn = 0
         self.llm_providers = llm_providers
         self.scorer_llm_provider = scorer_llm_provider
@@ -150,6 +370,12 @@ class GameEngine:
         self.scorecard = None
         self.saves_dir = saves_dir
         self.engine_settings = engine_settings if engine_settings is not None else {}
+        # The number of history entries already written to each history sidecar
+        self._saved_history = {}
+        self._save_executor = None
+        self._pending_save = None
+        # Imported here so that using the Scorecard alone doesn't load langgraph
+        from .game_master import GameMaster
         self.game_master = GameMaster(self.scorer_llm_provider)
 
         if self.scenario:
@@ -167,6 +393,40 @@ class GameEngine:
                         for key, value in data.items():
                             self.scorecard.data[player][key] = value
 
+    @classmethod
+    def from_save(cls, save_path, llm_providers: dict, scorer_llm_provider: LLMProvider, saves_dir="saves", engine_settings=None, game_state=None):
+        """
+        Creates a game engine from a save file, without loading the scenario
+        separately; the save already contains it.
+
+        :param save_path: The path to the save file.
+        :param llm_providers: A dictionary of LLM providers for each player.
+        :param scorer_llm_provider: An LLM provider for the scorer.
+        :param saves_dir: The directory auto-saves are written to.
+        :param engine_settings: A dictionary of engine settings.
+        :param game_state: The already-parsed contents of the save file (optional).
+        :return: The game engine.
+        """
+        engine = cls(llm_providers, scorer_llm_provider, saves_dir=saves_dir, engine_settings=engine_settings)
+        engine.load_game(save_path, game_state=game_state)
+        return engine
+
+    @classmethod
+    def from_state(cls, game_state, llm_providers: dict, scorer_llm_provider: LLMProvider, saves_dir="saves", engine_settings=None):
+        """
+        Creates a game engine from an in-memory game state, such as one
+        returned by to_state, without going through a save file. The state
+        is copied, so the new engine shares nothing with where it came from.
+
+        :param game_state: The game state.
+        :param llm_providers: A dictionary of LLM providers for each player.
+        :param scorer_llm_provider: An LLM provider for the scorer.
+        :param saves_dir: The directory auto-saves are written to.
+        :param engine_settings: A dictionary of engine settings.
+        :return: The game engine.
+        """
+        return cls.from_save(None, llm_providers, scorer_llm_provider, saves_dir=saves_dir, engine_settings=engine_settings, game_state=copy.deepcopy(game_state))
+
     def initialize_system_prompts(self):
         """
         Initializes the conversation history for each AI player with their system prompt.
@@ -202,22 +462,22 @@ class GameEngine:
         if not ai_players:
             print("No AI players found in the scenario. The simulation will run without AI actions.")
 
+        prefetched_actions = None
+        prefetch_messages = []
         while self.turn < max_turns:
             self.turn += 1
             print(f"--- Turn {self.turn} ---")
 
             if ai_players:
-                for player in ai_players:
-                    # Generate a prompt for the LLM
-                    prompt = self.generate_prompt(player)
-
-                    # Get the LLM's action
-                    print(f"Getting action for {player['name']}...")
-                    provider = self.llm_providers.get(player['name'])
-                    if not provider:
-                        print(f"Warning: No LLM provider found for player {player['name']}. Skipping turn.")
-                        continue
-                    action = provider.get_response(player['name'], prompt)
+                if prefetched_actions:
+                    actions = prefetched_actions.result()
+                    prefetched_actions = None
+                    # Held back while the user was at the prompt
+                    for message in prefetch_messages:
+                        print(message)
+                else:
+                    actions = self.get_player_actions(ai_players)
+                for player, action in actions:
                     print(f"AI Action from {player['name']}: {action}")
 
                     # Store the action in the history
@@ -233,17 +493,73 @@ class GameEngine:
                 self.scorecard.turn_date = self.get_turn_date()
                 ui.display_scores(self.scorecard)
 
-            # Auto-save the game
-            if not os.path.exists(self.saves_dir):
-                os.makedirs(self.saves_dir)
-            self.save_game(os.path.join(self.saves_dir, "autosave.json"))
+            # Auto-save the game while the next turn is played
+            os.makedirs(self.saves_dir, exist_ok=True)
+            self.save_game_in_background(os.path.join(self.saves_dir, "autosave.json"))
             print("Game auto-saved.")
 
             if self.engine_settings.get("step_through_turns") and ui:
-                ui.wait_for_turn()
-
+                # Fetch the next turn's actions while the user reads this one
+                if ai_players and self.turn < max_turns:
+                    prefetch_messages = []
+                    executor = ThreadPoolExecutor(max_workers=1)
+                    prefetched_actions = executor.submit(self.get_player_actions, ai_players, self.turn + 1, prefetch_messages)
+                    executor.shutdown(wait=False)
+                try:
+                    ui.wait_for_turn()
+                except BaseException:
+                    # The user quit at the prompt, so the prefetched turn won't be played
+                    if prefetched_actions:
+                        prefetched_actions.cancel()
+                    raise
+
+        self.flush_saves()
         print("Game simulation finished.")
 
+    def get_player_actions(self, ai_players, turn=None, messages=None):
+        """
+        Gets a turn's action from every AI player.
+
+        The LLM calls are network-bound and independent of each other, so they
+        are issued concurrently on a thread pool. Players that share a provider
+        are sent to it as one batch. Each player's history is only touched by
+        its own call.
+
+        :param ai_players: The AI players to get actions for.
+        :param turn: The turn to get actions for (defaults to the current turn).
+        :param messages: A list to collect progress messages in instead of printing them (optional).
+        :return: A list of (player, action) tuples, in player order.
+        """
+        log = print if messages is None else messages.append
+
+        # Group the players by provider, keeping player order within each group
+        batches = {}
+        for player in ai_players:
+            provider = self.llm_providers.get(player['name'])
+            if not provider:
+                log(f"Warning: No LLM provider found for player {player['name']}. Skipping turn.")
+                continue
+            # Generate a prompt for the LLM
+            prompt = self.generate_prompt(player, turn)
+            log(f"Getting action for {player['name']}...")
+            batches.setdefault(id(provider), (provider, []))[1].append((player, prompt))
+
+        if not batches:
+            return []
+
+        with ThreadPoolExecutor(max_workers=len(batches)) as executor:
+            futures = []
+            for provider, batch in batches.values():
+                future = executor.submit(provider.get_responses, [(player['name'], prompt) for player, prompt in batch])
+                futures.append((batch, future))
+
+            actions = {}
+            for batch, future in futures:
+                for (player, _), response in zip(batch, future.result()):
+                    actions[player['name']] = (player, response)
+
+        return [actions[player['name']] for player in ai_players if player['name'] in actions]
+
     def get_turn_date(self):
         from datetime import datetime, timedelta
 
@@ -259,10 +575,13 @@ class GameEngine:
         """
         return [p for p in self.scenario.get("players", []) if p.get("type") == "ai"]
 
-    def generate_prompt(self, player):
+    def generate_prompt(self, player, turn=None):
         """
         Generates a prompt for the LLM based on the current game state.
         This prompt provides the turn-specific context.
+
+        :param player: The player to generate the prompt for.
+        :param turn: The turn to generate the prompt for (defaults to the current turn).
         """
         scenario = self.scenario
         player_entity_key = scenario.get("player_entity_key", "countries")
@@ -271,7 +590,7 @@ class GameEngine:
         player_entity_name = player.get("controls")
         player_entity_data = player_entities.get(player_entity_name, {})
 
-        prompt = f"It is now Turn {self.turn}.\n"
+        prompt = f"It is now Turn {turn if turn is not None else self.turn}.\n"
 
         # Add dynamic context to the prompt
         if "parameters" in scenario and scenario["parameters"]:
@@ -308,6 +627,10 @@ class GameEngine:
             print("No scoring parameters found in the scenario. Skipping scoring.")
             return
 
+        # The rubric is the same every turn, so it is sent once as the
+        # scorer's system prompt rather than repeated in each turn's prompt.
+        self.scorer_llm_provider.get_or_create_history("scorer", self._generate_scoring_rubric())
+
         print("Getting scores from LLM...")
         if self.engine_settings.get("debug_mode"):
             print("\n--- Scoring LLM Call ---")
@@ -330,9 +653,19 @@ class GameEngine:
             if self.engine_settings.get("debug_mode"):
                 print(f"Malformed JSON string: {response_str}")
 
+    def _generate_scoring_rubric(self):
+        """
+        Generates the scorer's system prompt, describing the scoring criteria.
+        """
+        prompt = "You are an impartial judge. Each turn you will be given the history of actions for that turn. Based on it, please provide a brief reasoning for your scoring decisions and then score every player at once on the following criteria:\n"
+        for score_name, config in self.scenario.get("scoring_parameters", {}).items():
+            prompt += f"  - {score_name}: {config.get('prompt', '')}\n"
+        return prompt
+
     def _generate_scoring_request(self):
         """
         Generates a prompt and a tool schema for the LLM to score the players.
+        The scoring criteria are sent separately, see _generate_scoring_rubric.
         """
         scenario = self.scenario
         scoring_params = scenario.get("scoring_parameters")
@@ -340,10 +673,7 @@ class GameEngine:
             return None, None
 
         # Generate the text prompt
-        prompt = "You are an impartial judge. Based on the history of actions below, please provide a brief reasoning for your scoring decisions and then score each player on the following criteria:\n"
-        for score_name, config in scoring_params.items():
-            prompt += f"  - {score_name}: {config.get('prompt', '')}\n"
-        prompt += "\n--- History of Actions ---\n"
+        prompt = "--- History of Actions ---\n"
         recent_history = [h for h in self.history if h['turn'] == self.turn]
         for event in recent_history:
             prompt += f"Turn {event['turn']}, {event['player']}: {event['action']}\n"
@@ -387,33 +717,136 @@ class GameEngine:
 
         return prompt, tools
 
+    def to_state(self):
+        """
+        Returns the current game state, in the form written to save files.
+
+        The state shares its scenario, history and scorecard data with the
+        engine rather than copying them; from_state copies them instead.
+
+        :return: The game state as a dictionary.
+        """
+        return {
+            "turn": self.turn,
+            "scenario": self.scenario,
+            "history": self.history,
+            "scorecard": self.scorecard.data if self.scorecard else {}
+        }
+
     def save_game(self, save_path):
         """
         Saves the current game state to a file.
 
+        The history is kept in an append-only sidecar next to the save file
+        (see history_path_for), so saving again to the same path after a turn
+        only writes that turn's actions rather than the whole history.
+
+        :param save_path: The path to the save file, as a string or os.PathLike.
+        """
+        self.flush_saves()
+        self._write_save(*self._prepare_save(save_path))
+
+    def save_game_in_background(self, save_path):
+        """
+        Saves the current game state to a file on a background thread, so the
+        write overlaps with the next turn. The state is captured before this
+        returns; call flush_saves to wait for the write to finish.
+
         :param save_path: The path to the save file.
         """
+        # Saves are written one at a time, in order
+        self.flush_saves()
+        if self._save_executor is None:
+            self._save_executor = ThreadPoolExecutor(max_workers=1)
+        self._pending_save = self._save_executor.submit(self._write_save, *self._prepare_save(save_path))
+
+    def flush_saves(self):
+        """
+        Waits for a background save to finish, raising any error it raised.
+        """
+        if self._pending_save is not None:
+            pending, self._pending_save = self._pending_save, None
+            pending.result()
+
+    def _prepare_save(self, save_path):
+        """
+        Captures what a save needs to write, so the game can carry on while
+        it is written.
+
+        :return: The arguments for _write_save.
+        """
+        history_path = history_path_for(save_path)
+        saved = self._saved_history.get(history_path, 0)
+        if not 0 < saved <= len(self.history) or not os.path.exists(history_path):
+            saved = 0
+
+        # The history keys come before the scenario, so a replay can find
+        # them without parsing past it. Scores change each turn, so they are
+        # copied; history entries are never changed once added.
         game_state = {
             "turn": self.turn,
+            "history_file": os.path.basename(history_path),
+            "history_length": len(self.history),
             "scenario": self.scenario,
-            "history": self.history,
-            "scorecard": self.scorecard.data if self.scorecard else {}
+            "scorecard": copy.deepcopy(self.scorecard.data) if self.scorecard else {}
         }
-        with open(save_path, 'w') as f:
-            json.dump(game_state, f, indent=2)
+        return save_path, history_path, saved > 0, self.history[saved:], game_state
 
-    def load_game(self, save_path):
+    def _write_save(self, save_path, history_path, append, new_history, game_state):
+        """
+        Writes a save prepared by _prepare_save.
+        """
+        history_data = b"".join(_dumps(entry) + b"\n" for entry in new_history)
+        if append:
+            with open(history_path, 'ab') as f:
+                f.write(history_data)
+        else:
+            # A full rewrite is swapped in like the save itself, so the
+            # current save never points at a truncated history
+            tmp_history_path = f"{history_path}.tmp"
+            with open(tmp_history_path, 'wb') as f:
+                f.write(history_data)
+            os.replace(tmp_history_path, history_path)
+        # Recorded straight away, so if writing the save below fails the next
+        # save doesn't write these entries again
+        self._saved_history[history_path] = game_state["history_length"]
+
+        if orjson is not None:
+            data = orjson.dumps(game_state, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(game_state, indent=2, ensure_ascii=False).encode("utf-8")
+
+        # Write to a temporary file and swap it in, so an interrupted save
+        # never leaves a truncated file behind. The history is written first;
+        # entries past history_length are ignored when loading.
+        tmp_path = f"{save_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, save_path)
+
+    def load_game(self, save_path, game_state=None):
         """
         Loads a game state from a file.
 
         :param save_path: The path to the save file.
+        :param game_state: The already-parsed contents of the save file (optional). If given, the file is not read again.
         """
-        with open(save_path, 'r') as f:
-            game_state = json.load(f)
+        if game_state is None:
+            with open(save_path, 'rb') as f:
+                data = f.read()
+            game_state = orjson.loads(data) if orjson is not None else json.loads(data)
 
         self.turn = game_state["turn"]
         self.scenario = game_state["scenario"]
-        self.history = game_state["history"]
+        if "history" in game_state:
+            # Saves written before the history sidecar was introduced
+            self.history = game_state["history"]
+        else:
+            history_path = history_file_path(save_path, game_state["history_file"])
+            self.history = list(read_history(history_path, game_state["history_length"]))
+        # The loaded history isn't known to match any sidecar, so the next save rewrites it
+        self.flush_saves()
+        self._saved_history = {}
 
         if "scorecard" in self.scenario:
             self.scorecard = Scorecard(self.scenario)
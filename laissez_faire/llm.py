@@ -1,4 +1,24 @@
-import openai
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import h2
+except ImportError:
+    h2 = None
+
+# Prompts shorter than this are interned so repeated turns share one string object.
+INTERN_MAX_LENGTH = 4096
+
+
+def estimate_tokens(message):
+    """
+    Estimates the number of tokens in a chat message.
+
+    Uses the rough heuristic of four characters per token, plus a small
+    per-message overhead for the role and formatting. Replies with no text
+    content, such as refusals and tool-only replies, count as empty.
+    """
+    return len(message.get("content") or "") // 4 + 4
 
 
 class LLMProvider:
@@ -7,7 +27,7 @@ class LLMProvider:
     conversation history.
     """
 
-    def __init__(self, api_key=None, base_url=None, max_history_length=10, model_name="gpt-3.5-turbo", summarizer_provider=None):
+    def __init__(self, api_key=None, base_url=None, max_history_length=10, model_name="gpt-3.5-turbo", summarizer_provider=None, token_budget=3000, response_cache=None, http2=False):
         """
         Initializes the LLM provider.
 
@@ -16,6 +36,9 @@ class LLMProvider:
         :param max_history_length: The maximum number of messages to keep in the history.
         :param model_name: The specific model to use (e.g., 'gpt-3.5-turbo').
         :param summarizer_provider: An optional LLM provider for summarizing history.
+        :param token_budget: The estimated number of tokens the history may use before it is summarized.
+        :param response_cache: An optional ResponseCache for reusing responses to identical requests.
+        :param http2: Whether to multiplex concurrent requests over one HTTP/2 connection (needs the h2 package).
         """
         self.model_name = model_name
         self.api_key = api_key
@@ -23,6 +46,10 @@ class LLMProvider:
         self.histories = {}
         self.max_history_length = max_history_length
         self.summarizer_provider = summarizer_provider
+        self.token_budget = token_budget
+        self.response_cache = response_cache
+        self.http2 = http2
+        self._client = None
 
     def get_or_create_history(self, player_name, system_prompt=None):
         """
@@ -35,7 +62,7 @@ class LLMProvider:
         if player_name not in self.histories:
             self.histories[player_name] = []
             if system_prompt:
-                self.histories[player_name].append({"role": "system", "content": system_prompt})
+                self.histories[player_name].append({"role": "system", "content": sys.intern(system_prompt)})
         return self.histories[player_name]
 
     def get_response(self, player_name, prompt, tools=None):
@@ -53,6 +80,8 @@ class LLMProvider:
         self.summarize_history(player_name)
         history = self.get_or_create_history(player_name)
 
+        if len(prompt) < INTERN_MAX_LENGTH:
+            prompt = sys.intern(prompt)
         history.append({"role": "user", "content": prompt})
 
         response_content = self._get_response_openai(history, tools)
@@ -60,30 +89,98 @@ class LLMProvider:
         history.append({"role": "assistant", "content": response_content})
         return response_content
 
-    def summarize_history(self, player_name):
+    def get_responses(self, requests, tools=None):
         """
-        Summarizes the history for a player if it exceeds the max length.
+        Gets responses for several players from the LLM at once.
+
+        Each player's history is only touched by its own request, so the
+        requests are sent concurrently and share one client connection pool.
+
+        :param requests: A list of (player_name, prompt) tuples.
+        :param tools: An optional list of tools for function calling.
+        :return: The responses, in the same order as the requests.
         """
-        history = self.histories.get(player_name, [])
-        if len(history) > self.max_history_length:
-            print(f"Summarizing history for {player_name}...")
+        if len(requests) == 1:
+            player_name, prompt = requests[0]
+            return [self.get_response(player_name, prompt, tools)]
 
-            # Find the system prompt and keep it
-            system_prompt = None
-            if history and history[0]["role"] == "system":
-                system_prompt = history.pop(0)
+        # Create the client up front so the concurrent requests don't race to create it
+        if self.api_key:
+            self._get_client()
 
-            # Use the summarizer provider if available, otherwise use self
-            summarizer = self.summarizer_provider if self.summarizer_provider else self
+        with ThreadPoolExecutor(max_workers=len(requests)) as executor:
+            futures = [executor.submit(self.get_response, player_name, prompt, tools) for player_name, prompt in requests]
+            return [future.result() for future in futures]
 
-            # Get the summary
-            summary = summarizer.get_response(f"summarizer_{player_name}", "\n".join([f"{m['role']}: {m['content']}" for m in history]))
+    def summarize_history(self, player_name):
+        """
+        Summarizes the oldest part of a player's history once it exceeds the
+        token budget or the maximum number of messages.
 
-            # Replace the history with the summary
-            self.histories[player_name] = []
-            if system_prompt:
-                self.histories[player_name].append(system_prompt)
-            self.histories[player_name].append({"role": "system", "content": f"Summary of previous events: {summary}"})
+        The newest messages that fit in half of both limits are kept verbatim;
+        everything older is compressed into a single summary message.
+        """
+        history = self.histories.get(player_name, [])
+        total_tokens = sum(estimate_tokens(m) for m in history)
+        if total_tokens <= self.token_budget and len(history) <= self.max_history_length:
+            return
+
+        print(f"Summarizing history for {player_name}...")
+
+        # Find the system prompt and keep it
+        system_prompt = None
+        messages = history
+        if history and history[0]["role"] == "system":
+            system_prompt = history[0]
+            messages = history[1:]
+
+        # Keep the newest messages that fit, walking back from the tail
+        kept_tokens = 0
+        split = len(messages)
+        while split > 0 and len(messages) - split < self.max_history_length // 2:
+            tokens = estimate_tokens(messages[split - 1])
+            if kept_tokens + tokens > self.token_budget // 2:
+                break
+            kept_tokens += tokens
+            split -= 1
+        if split == 0:
+            return
+        to_summarize, kept = messages[:split], messages[split:]
+
+        # Use the summarizer provider if available, otherwise use self
+        summarizer = self.summarizer_provider if self.summarizer_provider else self
+
+        # Get the summary
+        summary = summarizer.get_response(f"summarizer_{player_name}", "\n".join([f"{m['role']}: {m['content']}" for m in to_summarize]))
+
+        # Replace the summarized messages with the summary
+        self.histories[player_name] = []
+        if system_prompt:
+            self.histories[player_name].append(system_prompt)
+        self.histories[player_name].append({"role": "system", "content": f"Summary of previous events: {summary}"})
+        self.histories[player_name].extend(kept)
+
+    def _get_client(self):
+        """
+        Returns the OpenAI client, creating it on first use so that its
+        connection pool is reused across calls.
+        """
+        if self._client is None:
+            # Imported here, not at module level, as the SDK is slow to import
+            import openai
+
+            client_options = {}
+            if self.http2:
+                if h2 is None:
+                    print("Warning: HTTP/2 needs the 'h2' package. Falling back to HTTP/1.1.")
+                else:
+                    client_options["http_client"] = openai.DefaultHttpxClient(http2=True)
+            self._client = openai.OpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                **client_options
+            )
+        return self._client
 
     def _get_response_openai(self, messages, tools=None):
         """
@@ -92,10 +189,16 @@ class LLMProvider:
         if not self.api_key:
             raise ValueError("API key is required for OpenAI-compatible models.")
 
-        client = openai.OpenAI(
-            api_key=self.api_key,
-            base_url=self.base_url
-        )
+        cache_key = None
+        if self.response_cache:
+            cache_key = self.response_cache.make_key(self.model_name, messages, tools)
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        # Imported after the cache lookup, so cached responses never load the SDK
+        import openai
+        client = self._get_client()
 
         try:
             completion_params = {
@@ -112,9 +215,13 @@ class LLMProvider:
             if message.tool_calls:
                 # We only handle the first tool call for now
                 tool_call = message.tool_calls[0]
-                return tool_call.function.arguments
+                content = tool_call.function.arguments
+            else:
+                content = message.content
 
-            return message.content
+            if cache_key is not None and content is not None:
+                self.response_cache.put(cache_key, content)
+            return content
         except openai.APIError as e:
             print(f"Error from OpenAI API: {e}")
             return "Error: Could not get a response from the model."
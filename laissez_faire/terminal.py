@@ -1,5 +1,6 @@
 from rich.console import Console
 from rich.panel import Panel
+from rich.prompt import Prompt
 from rich.table import Table
 
 class TerminalUI:
@@ -7,11 +8,15 @@ class TerminalUI:
     The terminal user interface for Laissez Faire.
     """
 
-    def __init__(self):
+    def __init__(self, console=None, null=False):
         """
         Initializes the terminal UI.
+
+        :param console: An existing rich Console to draw on (optional).
+        :param null: Whether to skip all display and waiting, for headless runs.
         """
-        self.console = Console()
+        self.console = console if console is not None else Console()
+        self.null = null
 
     def display_welcome(self, scenario_name):
         """
@@ -19,6 +24,8 @@ class TerminalUI:
 
         :param scenario_name: The name of the loaded scenario.
         """
+        if self.null:
+            return
         self.console.print(Panel(f"Welcome to Laissez Faire!\nLoaded scenario: [bold green]{scenario_name}[/bold green]", title="Laissez Faire", border_style="blue"))
 
     def display_scenario_details(self, scenario):
@@ -27,6 +34,8 @@ class TerminalUI:
 
         :param scenario: The scenario data.
         """
+        if self.null:
+            return
         table = Table(title="Scenario Details")
         table.add_column("Parameter", style="cyan")
         table.add_column("Value", style="magenta")
@@ -40,7 +49,7 @@ class TerminalUI:
         """
         Displays the current scorecard.
         """
-        if not scorecard:
+        if self.null or not scorecard:
             return
 
         # The scorecard.render() method will return a string,
@@ -48,8 +57,43 @@ class TerminalUI:
         score_output = scorecard.render()
         self.console.print(Panel(score_output, title="Scorecard", border_style="green"))
 
+    def choose_from_list(self, title, options, page_size=20):
+        """
+        Asks the user to pick one of a list of options by number. Long lists
+        are shown a page at a time; entering 'n' moves to the next page.
+
+        :param title: The title of the list.
+        :param options: The options to choose from.
+        :param page_size: The number of options shown per page.
+        :return: The chosen option.
+        """
+        start = 0
+        while True:
+            page = options[start:start + page_size]
+            choices = {str(number): option for number, option in enumerate(page, 1)}
+
+            table = Table(title=title)
+            table.add_column("#", style="cyan")
+            table.add_column("Name", style="magenta")
+            for number, option in choices.items():
+                table.add_row(number, option)
+            self.console.print(table)
+
+            prompt_choices = list(choices)
+            if len(options) > page_size:
+                prompt_choices.append("n")
+            choice = Prompt.ask("Enter a number", choices=prompt_choices, console=self.console, show_choices=False)
+            if choice != "n":
+                return choices[choice]
+
+            start += page_size
+            if start >= len(options):
+                start = 0
+
     def wait_for_turn(self):
         """
         Waits for the user to press Enter to continue to the next turn.
         """
+        if self.null:
+            return
         input("Press Enter to continue to the next turn...")
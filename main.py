@@ -1,52 +1,146 @@
+import contextlib
+import copy
+import functools
 import json
+import mmap
 import os
-from laissez_faire.engine import GameEngine
+import re
+from concurrent.futures import ThreadPoolExecutor
 from laissez_faire.terminal import TerminalUI
-from laissez_faire.llm import LLMProvider
-from rich.console import Console
 from rich.prompt import Prompt
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Errors raised for malformed JSON by the available parsers
+JSON_ERRORS = (json.JSONDecodeError, ijson.JSONError) if ijson is not None else (json.JSONDecodeError,)
+
+DRIVE_LETTER_RE = re.compile(r"^[A-Za-z]:")
+SCENARIOS_DIR = "laissez_faire/scenarios"
+SAVES_DIR = "saves"
+# Suffixes of the files offered by the scenario and save pickers
+JSON_SUFFIXES = (".json",)
+# Set to 1 to run games without drawing the terminal UI, e.g. for batch runs
+HEADLESS_ENV_VAR = "LAISSEZ_FAIRE_HEADLESS"
+
+def is_headless():
+    """
+    Returns whether games should run without drawing the terminal UI, as
+    requested through the LAISSEZ_FAIRE_HEADLESS environment variable.
+    """
+    return os.environ.get(HEADLESS_ENV_VAR, "").lower() in ("1", "true", "yes")
+
+@functools.lru_cache(maxsize=8)
+def _resolve_base_dir(base_dir):
+    """
+    Resolves an absolute base directory to its real path. The base
+    directories are constants, so this is only done once per directory.
+    """
+    return os.path.realpath(base_dir)
+
 def get_safe_path(base_dir, filename):
     """
     Joins a base directory and a filename, and ensures the resulting path is
     within the base directory.
     """
-    # Sanitize the filename to prevent directory traversal
-    if ".." in filename or filename.startswith("/"):
+    # Reject unsafe filenames with string checks before touching the filesystem
+    parts = filename.replace("\\", "/").split("/")
+    if (not filename or "\x00" in filename or filename.startswith(("/", "\\"))
+            or DRIVE_LETTER_RE.match(filename)
+            or any(part in ("", ".", "..") for part in parts)):
         print(f"Error: Invalid filename '{filename}'.")
         return None
 
-    # Get the absolute path of the base directory and the intended file
-    base_dir_abs = os.path.abspath(base_dir)
-    file_path_abs = os.path.abspath(os.path.join(base_dir_abs, filename))
+    # Resolve symlinks too, so a link inside the base directory can't point out of it
+    # Cached by absolute path, so a relative base directory follows the current directory
+    base_dir_real = _resolve_base_dir(os.path.abspath(base_dir))
+    file_path_real = os.path.realpath(os.path.join(base_dir_real, filename))
 
     # Check if the file path is within the base directory
-    if os.path.commonpath([base_dir_abs, file_path_abs]) != base_dir_abs:
+    if not file_path_real.startswith(base_dir_real + os.sep):
         print(f"Error: Path traversal attempt detected for filename '{filename}'.")
         return None
 
-    return file_path_abs
+    return file_path_real
+
+@contextlib.contextmanager
+def _open_binary(source):
+    """
+    Opens a path for binary reading, or passes an already-open binary file
+    through. Files passed in are left open for the caller to close.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            yield f
+    else:
+        yield source
+
+def load_json_file(source, mapped=False):
+    """
+    Reads and parses a JSON file, using orjson when it is available.
+    Raises json.JSONDecodeError on invalid JSON either way.
+
+    :param source: The path to the JSON file, or the file opened in binary mode.
+    :param mapped: Parse straight from a memory map of the file rather than
+        reading it into a buffer first. Worthwhile for large save files.
+    """
+    with _open_binary(source) as f:
+        if orjson is None:
+            return json.load(f)
+        if mapped and os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return orjson.loads(view)
+        return orjson.loads(f.read())
+
+def list_json_files(directory):
+    """
+    Lists the names of the JSON files in a directory in sorted order, or an
+    empty list if the directory does not exist.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return sorted(e.name for e in entries if e.name.endswith(JSON_SUFFIXES) and e.is_file())
+    except FileNotFoundError:
+        return []
+
+@functools.lru_cache(maxsize=4)
+def _load_config_cached(config_path, mtime_ns):
+    """
+    Parses a config file. Cached by path and modification time, so the file is
+    only parsed again after it changes.
+    """
+    return load_json_file(config_path)
 
 def get_providers(config_path="config.json"):
     """
     Loads LLM provider configurations and engine settings from a file.
     """
     try:
-        with open(config_path, "r") as f:
-            config = json.load(f)
-        
-        providers = config.get("providers", {})
-        engine_settings = config.get("engine_settings", {})
-        
+        abs_config_path = os.path.abspath(config_path)
+        config = _load_config_cached(abs_config_path, os.stat(abs_config_path).st_mtime_ns)
+
+        # Copy so callers can't modify the cached config
+        providers = copy.deepcopy(config.get("providers", {}))
+        engine_settings = copy.deepcopy(config.get("engine_settings", {}))
+
         return providers, engine_settings
     except FileNotFoundError:
         print(f"Warning: {config_path} not found. LLM providers will not be available.")
         return {}, {}
 
-def create_llm_provider(provider_name, llm_providers_config, summarizer_provider=None):
+def create_llm_provider(provider_name, llm_providers_config, summarizer_provider=None, response_cache=None):
     """
     Helper function to create a single LLM provider.
     """
+    from laissez_faire.llm import LLMProvider
+
     provider_config = llm_providers_config.get(provider_name)
     if not provider_config:
         raise ValueError(f"Provider '{provider_name}' not found in config.json")
@@ -55,36 +149,84 @@ def create_llm_provider(provider_name, llm_providers_config, summarizer_provider
         api_key=provider_config.get("api_key"),
         base_url=provider_config.get("base_url"),
         model_name=provider_config.get("model_name"),
-        summarizer_provider=summarizer_provider
+        summarizer_provider=summarizer_provider,
+        token_budget=provider_config.get("token_budget", 3000),
+        response_cache=response_cache,
+        http2=provider_config.get("http2", False)
     )
 
-def start_new_game(scenario_path, config_path="config.json"):
+def create_response_cache(engine_settings):
+    """
+    Creates the shared LLM response cache if one is configured.
+    """
+    from laissez_faire.cache import ResponseCache
+
+    cache_path = engine_settings.get("llm_cache_path")
+    return ResponseCache(cache_path) if cache_path else None
+
+def get_ai_player_providers(scenario):
+    """
+    Maps the name of each AI player in a scenario to the name of its LLM
+    provider, in player order.
+
+    :raises ValueError: If an AI player has no llm_provider.
+    """
+    ai_player_providers = {}
+    for player in scenario.get("players", []):
+        if player.get("type") == "ai":
+            provider_name = player.get("llm_provider")
+            if not provider_name:
+                raise ValueError(f"llm_provider not defined for player {player['name']}")
+            ai_player_providers[player["name"]] = provider_name
+    return ai_player_providers
+
+def build_llm_providers(scenario, llm_providers_config, engine_settings):
+    """
+    Creates the scorer LLM provider and the LLM providers for a scenario's AI
+    players. AI players configured with the same provider share one instance,
+    since histories are kept per player.
+
+    :return: A tuple of the scorer provider and a dict of providers by player name.
+    """
+    ai_player_providers = get_ai_player_providers(scenario)
+    scorer_provider_name = scenario.get("scorer_llm_provider")
+    if not scorer_provider_name:
+        raise ValueError("scorer_llm_provider not defined in scenario")
+    response_cache = create_response_cache(engine_settings)
+    scorer_llm_provider = create_llm_provider(scorer_provider_name, llm_providers_config, response_cache=response_cache)
+
+    # One provider per distinct provider name, in first-use order
+    providers_by_name = {
+        provider_name: create_llm_provider(provider_name, llm_providers_config, summarizer_provider=scorer_llm_provider, response_cache=response_cache)
+        for provider_name in dict.fromkeys(ai_player_providers.values())
+    }
+    llm_providers = {name: providers_by_name[provider_name] for name, provider_name in ai_player_providers.items()}
+
+    return scorer_llm_provider, llm_providers
+
+def start_new_game(scenario_path, config_path="config.json", ui=None):
     """
     Starts a new game from a scenario file.
+
+    :param scenario_path: The path to the scenario file, or the file opened in binary mode.
+    :param ui: The TerminalUI to use (optional). A new one is created if not given.
     """
-    llm_providers_config, engine_settings = get_providers(config_path)
+    from laissez_faire.engine import GameEngine
+
+    # Read the config and the scenario concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        config_future = executor.submit(get_providers, config_path)
+        scenario_future = executor.submit(load_json_file, scenario_path)
+    llm_providers_config, engine_settings = config_future.result()
 
     try:
-        with open(scenario_path, 'r') as f:
-            scenario = json.load(f)
+        scenario = scenario_future.result()
     except (FileNotFoundError, json.JSONDecodeError) as e:
         print(f"Error loading scenario file: {e}")
         return
 
     try:
-        scorer_provider_name = scenario.get("scorer_llm_provider")
-        if not scorer_provider_name:
-            raise ValueError("scorer_llm_provider not defined in scenario")
-        scorer_llm_provider = create_llm_provider(scorer_provider_name, llm_providers_config)
-
-        llm_providers = {}
-        for player in scenario.get("players", []):
-            if player.get("type") == "ai":
-                provider_name = player.get("llm_provider")
-                if not provider_name:
-                    raise ValueError(f"llm_provider not defined for player {player['name']}")
-                llm_providers[player["name"]] = create_llm_provider(provider_name, llm_providers_config, summarizer_provider=scorer_llm_provider)
-
+        scorer_llm_provider, llm_providers = build_llm_providers(scenario, llm_providers_config, engine_settings)
     except ValueError as e:
         print(f"Error setting up LLM providers: {e}")
         return
@@ -92,55 +234,61 @@ def start_new_game(scenario_path, config_path="config.json"):
     engine = GameEngine(
         llm_providers=llm_providers,
         scorer_llm_provider=scorer_llm_provider,
-        scenario_path=scenario_path,
+        scenario=scenario,
         engine_settings=engine_settings
     )
-    ui = TerminalUI()
+    if ui is None:
+        ui = TerminalUI(null=is_headless())
 
-    ui.display_welcome(engine.scenario["name"])
-    ui.display_scenario_details(engine.scenario)
+    # Rich buffers everything printed inside the console's context and writes it once
+    with ui.console:
+        ui.display_welcome(engine.scenario["name"])
+        ui.display_scenario_details(engine.scenario)
 
     engine.run(ui=ui)
 
-def load_saved_game(save_path, config_path="config.json"):
+def load_saved_game(save_path, config_path="config.json", ui=None):
     """
     Loads a game from a save file.
+
+    :param save_path: The path to the save file, or the file opened in binary mode.
+    :param ui: The TerminalUI to use (optional). A new one is created if not given.
     """
-    llm_providers_config, engine_settings = get_providers(config_path)
+    from laissez_faire.engine import GameEngine
+
+    # Read the config and the save concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        config_future = executor.submit(get_providers, config_path)
+        game_state_future = executor.submit(load_json_file, save_path)
+    llm_providers_config, engine_settings = config_future.result()
 
     try:
-        with open(save_path, 'r') as f:
-            game_state = json.load(f)
+        game_state = game_state_future.result()
     except (FileNotFoundError, json.JSONDecodeError) as e:
         print(f"Error loading save file: {e}")
         return
     scenario = game_state["scenario"]
 
     try:
-        scorer_provider_name = scenario.get("scorer_llm_provider")
-        if not scorer_provider_name:
-            raise ValueError("scorer_llm_provider not defined in scenario")
-        scorer_llm_provider = create_llm_provider(scorer_provider_name, llm_providers_config)
-
-        llm_providers = {}
-        for player in scenario.get("players", []):
-            if player.get("type") == "ai":
-                provider_name = player.get("llm_provider")
-                if not provider_name:
-                    raise ValueError(f"llm_provider not defined for player {player['name']}")
-                llm_providers[player["name"]] = create_llm_provider(provider_name, llm_providers_config, summarizer_provider=scorer_llm_provider)
-
+        scorer_llm_provider, llm_providers = build_llm_providers(scenario, llm_providers_config, engine_settings)
     except ValueError as e:
         print(f"Error setting up LLM providers: {e}")
         return
 
-    engine = GameEngine(
-        llm_providers=llm_providers,
-        scorer_llm_provider=scorer_llm_provider,
-        engine_settings=engine_settings
-    )
-    engine.load_game(save_path)
-    ui = TerminalUI()
+    try:
+        engine = GameEngine.from_save(
+            save_path,
+            llm_providers=llm_providers,
+            scorer_llm_provider=scorer_llm_provider,
+            engine_settings=engine_settings,
+            game_state=game_state
+        )
+    except (FileNotFoundError, ValueError) as e:
+        # The save's history file is missing or shorter than the save expects
+        print(f"Error loading save file: {e}")
+        return
+    if ui is None:
+        ui = TerminalUI(null=is_headless())
 
     ui.display_welcome(engine.scenario["name"])
     print("\n--- Game Loaded ---")
@@ -148,35 +296,85 @@ def load_saved_game(save_path, config_path="config.json"):
 
     engine.run(ui=ui)
 
-def replay_game(save_path):
+@contextlib.contextmanager
+def open_replay(save_path, stream=True):
     """
-    Replays a game from a save file.
+    Opens a save file (a path or a binary file) for replay, yielding its turn
+    count, its scenario and an iterator over its history in chronological order.
+
+    With ijson installed and stream set, the history is streamed from the file
+    one entry at a time, so a long game is never held in memory all at once.
+    This relies on save files storing the history in turn order, as
+    GameEngine.save_game does. Saves that keep their history in a sidecar file
+    are read a line at a time. Otherwise the whole save is read and its files
+    are closed before anything is yielded.
     """
-    try:
-        with open(save_path, 'r') as f:
-            game_state = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError) as e:
-        print(f"Error loading save file for replay: {e}")
+    from laissez_faire.engine import history_file_path, read_history
+
+    if not stream or ijson is None:
+        game_state = load_json_file(save_path, mapped=True)
+        if "history" in game_state:
+            history = game_state["history"]
+        else:
+            history_path = history_file_path(save_path, game_state["history_file"])
+            history = read_history(history_path, game_state["history_length"])
+        history = sorted(history, key=lambda action: action["turn"])
+        yield game_state["turn"], game_state["scenario"], iter(history)
         return
 
-    scenario = game_state["scenario"]
-    history = game_state["history"]
+    with _open_binary(save_path) as f:
+        turn = next(ijson.items(f, 'turn'))
+        f.seek(0)
+        scenario = next(ijson.items(f, 'scenario', use_float=True))
+        f.seek(0)
+        # Find which history format the save uses from its first top-level history key
+        history_key = next(
+            value for prefix, event, value in ijson.parse(f)
+            if prefix == '' and event == 'map_key' and value in ('history', 'history_file')
+        )
+        f.seek(0)
+        if history_key == 'history':
+            yield turn, scenario, ijson.items(f, 'history.item', use_float=True)
+            return
 
-    ui = TerminalUI()
-    ui.display_welcome(scenario["name"])
-    ui.display_scenario_details(scenario)
+        history_file = next(ijson.items(f, 'history_file'))
+        f.seek(0)
+        history_length = next(ijson.items(f, 'history_length'))
+        history_path = history_file_path(f, history_file)
+        yield turn, scenario, read_history(history_path, history_length)
 
-    console = Console()
-    console.print("\n[bold green]--- Replay Started ---[/bold green]")
+def replay_game(save_path, ui=None, stream=True):
+    """
+    Replays a game from a save file.
 
-    for turn_number in range(1, game_state["turn"] + 1):
-        console.print(f"\n[bold]--- Turn {turn_number} ---[/bold]")
-        turn_actions = [h for h in history if h["turn"] == turn_number]
-        for action in turn_actions:
-            console.print(f"[cyan]{action['player']}:[/cyan] {action['action']}")
+    :param save_path: The path to the save file, or the file opened in binary mode.
+    :param ui: The TerminalUI to use (optional). A new one is created if not given.
+    :param stream: Whether to stream the history from the file during the replay
+        (with ijson), rather than reading it all up front and closing the file.
+    """
+    if ui is None:
+        ui = TerminalUI()
+    console = ui.console
 
-        if turn_number < game_state["turn"]:
-            Prompt.ask("Press Enter to continue to the next turn...")
+    try:
+        with open_replay(save_path, stream=stream) as (turn_count, scenario, history):
+            ui.display_welcome(scenario["name"])
+            ui.display_scenario_details(scenario)
+
+            console.print("\n[bold green]--- Replay Started ---[/bold green]")
+
+            next_action = next(history, None)
+            for turn_number in range(1, turn_count + 1):
+                console.print(f"\n[bold]--- Turn {turn_number} ---[/bold]")
+                while next_action is not None and next_action["turn"] <= turn_number:
+                    console.print(f"[cyan]{next_action['player']}:[/cyan] {next_action['action']}")
+                    next_action = next(history, None)
+
+                if turn_number < turn_count:
+                    Prompt.ask("Press Enter to continue to the next turn...")
+    except (FileNotFoundError, ValueError) + JSON_ERRORS as e:
+        print(f"Error loading save file for replay: {e}")
+        return
 
     console.print("\n[bold green]--- Replay Finished ---[/bold green]")
 
@@ -184,41 +382,41 @@ def main():
     """
     The main entry point for the Laissez-faire game.
     """
-    console = Console()
+    ui = TerminalUI(null=is_headless())
+    console = ui.console
     console.print("[bold blue]Welcome to Laissez Faire![/bold blue]")
 
     actions = ["Start a new game", "Load a saved game", "Replay a saved game"]
     choice = Prompt.ask("What would you like to do?", choices=actions, default="Start a new game")
 
     if choice == "Start a new game":
-        scenarios_dir = "laissez_faire/scenarios"
-        scenarios = [f for f in os.listdir(scenarios_dir) if f.endswith(".json")]
-        scenario_choice = Prompt.ask("Choose a scenario", choices=scenarios)
-        safe_path = get_safe_path(scenarios_dir, scenario_choice)
-        if safe_path:
-            start_new_game(safe_path)
+        scenarios = list_json_files(SCENARIOS_DIR)
+        scenario_choice = ui.choose_from_list("Choose a scenario", scenarios)
+        # Files are passed by path, so they are closed once parsed rather than
+        # held open while the game runs and autosaves
+        scenario_path = get_safe_path(SCENARIOS_DIR, scenario_choice)
+        if scenario_path:
+            start_new_game(scenario_path, ui=ui)
 
     elif choice == "Load a saved game":
-        saves_dir = "saves"
-        if not os.path.exists(saves_dir) or not os.listdir(saves_dir):
+        saves = list_json_files(SAVES_DIR)
+        if not saves:
             console.print("[bold red]No saved games found.[/bold red]")
             return
-        saves = [f for f in os.listdir(saves_dir) if f.endswith(".json")]
-        save_choice = Prompt.ask("Choose a save file", choices=saves)
-        safe_path = get_safe_path(saves_dir, save_choice)
-        if safe_path:
-            load_saved_game(safe_path)
+        save_choice = ui.choose_from_list("Choose a save file", saves)
+        save_path = get_safe_path(SAVES_DIR, save_choice)
+        if save_path:
+            load_saved_game(save_path, ui=ui)
 
     elif choice == "Replay a saved game":
-        saves_dir = "saves"
-        if not os.path.exists(saves_dir) or not os.listdir(saves_dir):
+        saves = list_json_files(SAVES_DIR)
+        if not saves:
             console.print("[bold red]No saved games found.[/bold red]")
             return
-        saves = [f for f in os.listdir(saves_dir) if f.endswith(".json")]
-        save_choice = Prompt.ask("Choose a save file to replay", choices=saves)
-        safe_path = get_safe_path(saves_dir, save_choice)
-        if safe_path:
-            replay_game(safe_path)
+        save_choice = ui.choose_from_list("Choose a save file to replay", saves)
+        save_path = get_safe_path(SAVES_DIR, save_choice)
+        if save_path:
+            replay_game(save_path, ui=ui, stream=False)
 
 if __name__ == "__main__":
     main()
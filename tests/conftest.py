@@ -1,13 +1,87 @@
+import copy
+import json
+import os
 import pytest
 from unittest.mock import MagicMock
 from laissez_faire.llm import LLMProvider
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-integration", action="store_true", default=False,
+        help="run the integration tests, which call real LLM APIs"
+    )
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-integration"):
+        return
+    skip_integration = pytest.mark.skip(reason="needs --run-integration to run")
+    for item in items:
+        if "integration" in item.keywords:
+            item.add_marker(skip_integration)
+
+class FakeLLMProvider(LLMProvider):
+    """
+    An LLMProvider that answers every prompt with a canned response and
+    records the prompts it was given, without any mock machinery.
+    """
+
+    def __init__(self, response=""):
+        super().__init__()
+        self.response = response
+        self.calls = []
+
+    def get_response(self, player_name, prompt, tools=None):
+        self.calls.append((player_name, prompt))
+        return self.response
+
 @pytest.fixture
 def mock_llm_providers():
-    """Fixture for a mock LLM providers dictionary."""
-    return {"player1": MagicMock(spec=LLMProvider)}
+    """Fixture for a fake LLM providers dictionary."""
+    return {"player1": FakeLLMProvider()}
 
 @pytest.fixture
 def mock_scorer_llm_provider():
     """Fixture for a mock scorer LLM provider."""
-    return MagicMock(spec=LLMProvider)
+    provider = MagicMock(spec=LLMProvider)
+    # Return valid (empty) scores by default; a bare MagicMock response can't
+    # be stored by the GameMaster's checkpointer.
+    provider.get_response.return_value = '{"scores": {}, "reasoning": ""}'
+    return provider
+
+SCENARIOS_DIR = "laissez_faire/scenarios"
+
+@pytest.fixture(scope="session")
+def load_bundled_scenario():
+    """
+    Loads a bundled scenario by name, parsing each file once per session.
+    Returns a copy so tests can't modify each other's scenarios.
+    """
+    parsed = {}
+
+    def load(name):
+        if name not in parsed:
+            with open(os.path.join(SCENARIOS_DIR, f"{name}.json"), "rb") as f:
+                parsed[name] = json.load(f)
+        return copy.deepcopy(parsed[name])
+
+    return load
+
+@pytest.fixture(scope="session")
+def modern_day_usa_scenario(load_bundled_scenario):
+    """The parsed modern_day_usa.json scenario, loaded once per session."""
+    return load_bundled_scenario("modern_day_usa")
+
+@pytest.fixture(scope="session")
+def philosophers_debate_scenario(load_bundled_scenario):
+    """The parsed philosophers_debate.json scenario, loaded once per session."""
+    return load_bundled_scenario("philosophers_debate")
+
+@pytest.fixture(scope="session")
+def local_llm():
+    """A keyless LLMProvider shared by tests that only read its state."""
+    return LLMProvider()
+
+@pytest.fixture
+def fresh_local_llm():
+    """A new keyless LLMProvider for tests that write to its histories."""
+    return LLMProvider()
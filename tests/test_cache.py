@@ -0,0 +1,59 @@
+import pytest
+from laissez_faire.cache import ResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Fixture for a response cache in a temporary directory."""
+    cache = ResponseCache(str(tmp_path / "llm_cache.db"))
+    yield cache
+    cache.close()
+
+
+def test_cache_miss_returns_none(cache):
+    """Tests that looking up an unknown key returns None."""
+    key = ResponseCache.make_key("model", [{"role": "user", "content": "hi"}])
+    assert cache.get(key) is None
+
+
+def test_cache_put_and_get(cache):
+    """Tests that a stored response can be retrieved."""
+    key = ResponseCache.make_key("model", [{"role": "user", "content": "hi"}])
+    cache.put(key, "hello")
+    assert cache.get(key) == "hello"
+
+
+def test_cache_persists_across_connections(tmp_path):
+    """Tests that cached responses survive reopening the database."""
+    path = str(tmp_path / "nested" / "llm_cache.db")
+    key = ResponseCache.make_key("model", [{"role": "user", "content": "hi"}])
+
+    cache = ResponseCache(path)
+    cache.put(key, "hello")
+    cache.close()
+
+    reopened = ResponseCache(path)
+    assert reopened.get(key) == "hello"
+    reopened.close()
+
+
+def test_make_key_depends_on_request():
+    """Tests that different models, messages or tools produce different keys."""
+    messages = [{"role": "user", "content": "hi"}]
+    key = ResponseCache.make_key("model", messages)
+    assert key == ResponseCache.make_key("model", list(messages))
+    assert key != ResponseCache.make_key("other-model", messages)
+    assert key != ResponseCache.make_key("model", [{"role": "user", "content": "bye"}])
+    assert key != ResponseCache.make_key("model", messages, tools=[{"type": "function"}])
+
+
+def test_make_key_is_stable_without_orjson(monkeypatch):
+    """Tests that the stdlib fallback produces the same key as orjson."""
+    import laissez_faire.cache as cache_module
+
+    messages = [{"role": "user", "content": "héllo"}]
+    tools = [{"type": "function", "function": {"name": "record_scores"}}]
+    key = ResponseCache.make_key("model", messages, tools)
+
+    monkeypatch.setattr(cache_module, "orjson", None)
+    assert ResponseCache.make_key("model", messages, tools) == key
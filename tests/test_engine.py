@@ -2,72 +2,73 @@ import pytest
 from laissez_faire.engine import GameEngine
 from laissez_faire.llm import LLMProvider
 import os
+import functools
 import json
+import threading
 from unittest.mock import MagicMock
 
-def test_load_scenario_success(mock_llm_providers, mock_scorer_llm_provider, tmp_path):
+# The scorer's tool call arguments for one turn of the philosophers debate
+_SCORER_RESPONSE = '{"scores": {"Einstein": {"eloquence": 1, "logic": 2, "relevance": 0, "originality": 0}, "Jobs": {"eloquence": 2, "logic": 1, "relevance": 0, "originality": 0}}}'
+
+def _mock_provider(response=None):
+    """A spec'd LLMProvider mock whose get_responses goes through its get_response."""
+    provider = MagicMock(spec=LLMProvider)
+    provider.get_response.return_value = response
+    provider.get_responses.side_effect = functools.partial(LLMProvider.get_responses, provider)
+    return provider
+
+@pytest.mark.parametrize("content, error", [
+    ('{"name": "Test Scenario", "start_date": "2024-01-01"}', None),
+    (None, FileNotFoundError),
+    ('{"name": "Test Scenario", "start_date": "2024-01-01"', json.JSONDecodeError),
+], ids=["success", "file_not_found", "invalid_json"])
+def test_load_scenario(mock_llm_providers, mock_scorer_llm_provider, tmp_path, content, error):
     """
-    Tests that a scenario is loaded correctly.
+    Tests that a scenario is loaded correctly, and that a missing or invalid
+    scenario file raises the matching error.
     """
-    # Create a dummy scenario file
-    scenario_content = {"name": "Test Scenario", "start_date": "2024-01-01"}
     scenario_path = tmp_path / "test_scenario.json"
-    scenario_path.write_text(json.dumps(scenario_content))
+    if content is not None:
+        scenario_path.write_bytes(content.encode("utf-8"))
 
-    engine = GameEngine(llm_providers=mock_llm_providers, scorer_llm_provider=mock_scorer_llm_provider, scenario_path=str(scenario_path))
-    assert engine.scenario["name"] == "Test Scenario"
-    assert engine.scenario["start_date"] == "2024-01-01"
-
-def test_load_scenario_file_not_found(mock_llm_providers, mock_scorer_llm_provider):
-    """
-    Tests that a FileNotFoundError is raised when the scenario file does not exist.
-    """
-    with pytest.raises(FileNotFoundError):
-        GameEngine(llm_providers=mock_llm_providers, scorer_llm_provider=mock_scorer_llm_provider, scenario_path="non_existent_scenario.json")
-
-def test_load_scenario_invalid_json(mock_llm_providers, mock_scorer_llm_provider, tmp_path):
-    """
-    Tests that an error is raised when the scenario file is not valid JSON.
-    """
-    # Create a dummy invalid scenario file
-    scenario_content = '{"name": "Test Scenario", "start_date": "2024-01-01"'
-    scenario_path = tmp_path / "invalid_scenario.json"
-    scenario_path.write_text(scenario_content)
-
-    with pytest.raises(json.JSONDecodeError):
-        GameEngine(llm_providers=mock_llm_providers, scorer_llm_provider=mock_scorer_llm_provider, scenario_path=str(scenario_path))
+    if error:
+        with pytest.raises(error):
+            GameEngine(llm_providers=mock_llm_providers, scorer_llm_provider=mock_scorer_llm_provider, scenario_path=str(scenario_path))
+    else:
+        engine = GameEngine(llm_providers=mock_llm_providers, scorer_llm_provider=mock_scorer_llm_provider, scenario_path=str(scenario_path))
+        assert engine.scenario["name"] == "Test Scenario"
+        assert engine.scenario["start_date"] == "2024-01-01"
 
 
-def test_game_engine_run_and_turn_increment(mock_llm_providers, mock_scorer_llm_provider):
+def test_game_engine_run_and_turn_increment(modern_day_usa_scenario, mock_llm_providers, mock_scorer_llm_provider, tmp_path):
     """
     Tests that the game engine's run method executes and increments the turn.
     """
-    engine = GameEngine(llm_providers=mock_llm_providers, scorer_llm_provider=mock_scorer_llm_provider, scenario_path="laissez_faire/scenarios/modern_day_usa.json")
+    engine = GameEngine(llm_providers=mock_llm_providers, scorer_llm_provider=mock_scorer_llm_provider, scenario=modern_day_usa_scenario, saves_dir=str(tmp_path))
     engine.run(max_turns=1)
     assert engine.turn == 1
 
 
-def test_scoring_system_with_function_calling(mock_scorer_llm_provider):
+def test_scoring_system_with_function_calling(philosophers_debate_scenario, mock_scorer_llm_provider, tmp_path):
     """
     Tests the scoring system using the new function calling mechanism.
     """
-    scenario_path = "laissez_faire/scenarios/philosophers_debate.json"
 
-    einstein_provider = MagicMock(spec=LLMProvider)
-    jobs_provider = MagicMock(spec=LLMProvider)
+    einstein_provider = _mock_provider()
+    jobs_provider = _mock_provider()
 
     mock_llm_providers = {
         "Albert Einstein": einstein_provider,
         "Steve Jobs": jobs_provider
     }
 
-    engine = GameEngine(llm_providers=mock_llm_providers, scorer_llm_provider=mock_scorer_llm_provider, scenario_path=scenario_path)
+    engine = GameEngine(llm_providers=mock_llm_providers, scorer_llm_provider=mock_scorer_llm_provider, scenario=philosophers_debate_scenario, saves_dir=str(tmp_path))
 
     einstein_provider.get_response.return_value = "Einstein's opening statement."
     jobs_provider.get_response.return_value = "Jobs' counter-argument."
 
     # Simulate the LLM returning a tool call with JSON arguments
-    mock_scorer_llm_provider.get_response.return_value = '{"scores": {"Einstein": {"eloquence": 1, "logic": 2, "relevance": 0, "originality": 0}, "Jobs": {"eloquence": 2, "logic": 1, "relevance": 0, "originality": 0}}}'
+    mock_scorer_llm_provider.get_response.return_value = _SCORER_RESPONSE
 
     mock_ui = MagicMock()
 
@@ -99,23 +100,22 @@ def test_run_with_no_ai_players(mock_llm_providers, mock_scorer_llm_provider, ca
     }
     scenario_path = tmp_path / "no_ai_scenario.json"
     scenario_path.write_text(json.dumps(scenario))
-    engine = GameEngine(llm_providers=mock_llm_providers, scorer_llm_provider=mock_scorer_llm_provider, scenario_path=str(scenario_path))
+    engine = GameEngine(llm_providers=mock_llm_providers, scorer_llm_provider=mock_scorer_llm_provider, scenario_path=str(scenario_path), saves_dir=str(tmp_path))
     engine.run(max_turns=1)
 
     # Check that the LLM was not called
     for provider in mock_llm_providers.values():
-        provider.get_response.assert_not_called()
+        assert provider.calls == []
 
     # Check the output
     captured = capsys.readouterr()
     assert "No AI players found" in captured.out
 
-def test_score_turn_invalid_json(mock_llm_providers, mock_scorer_llm_provider, capsys):
+def test_score_turn_invalid_json(philosophers_debate_scenario, mock_llm_providers, mock_scorer_llm_provider, capsys, tmp_path):
     """
     Tests that the engine handles invalid JSON from the LLM during scoring.
     """
-    scenario_path = "laissez_faire/scenarios/philosophers_debate.json"
-    engine = GameEngine(llm_providers=mock_llm_providers, scorer_llm_provider=mock_scorer_llm_provider, scenario_path=scenario_path)
+    engine = GameEngine(llm_providers=mock_llm_providers, scorer_llm_provider=mock_scorer_llm_provider, scenario=philosophers_debate_scenario, saves_dir=str(tmp_path))
 
     # Initialize scorecard data
     engine.scorecard.data = {
@@ -133,16 +133,15 @@ def test_score_turn_invalid_json(mock_llm_providers, mock_scorer_llm_provider, c
     assert "Error: Could not decode scores from LLM response." in captured.out
     assert engine.scorecard.data == {"Einstein": {"eloquence": 0, "logic": 0}, "Jobs": {"eloquence": 0, "logic": 0}}
 
-def test_initialize_system_prompts(mock_scorer_llm_provider):
+def test_initialize_system_prompts(philosophers_debate_scenario, mock_scorer_llm_provider):
     """
     Tests that system prompts are initialized correctly for AI players.
     """
-    scenario_path = "laissez_faire/scenarios/philosophers_debate.json"
     einstein_provider = MagicMock(spec=LLMProvider)
     jobs_provider = MagicMock(spec=LLMProvider)
     mock_llm_providers = {"Albert Einstein": einstein_provider, "Steve Jobs": jobs_provider}
 
-    GameEngine(llm_providers=mock_llm_providers, scorer_llm_provider=mock_scorer_llm_provider, scenario_path=scenario_path)
+    GameEngine(llm_providers=mock_llm_providers, scorer_llm_provider=mock_scorer_llm_provider, scenario=philosophers_debate_scenario)
 
     einstein_provider.get_or_create_history.assert_called_with("Albert Einstein", "You are playing the role of Albert Einstein. Your core argument is that intuition and imagination are the wellspring of true innovation. You should argue that rigorous analysis is a tool, but a subordinate one, used to formalize and verify the insights that come from a deeper, more intuitive place. You can draw on your own experiences with thought experiments (e.g., imagining riding on a beam of light) to illustrate your points. Your tone should be humble, thoughtful, and deeply curious. You are not dismissive of logic, but you see it as a craftsman's tool, not the architect's vision. Your goal is to persuade the audience that without a 'holy curiosity,' and the courage to make intuitive leaps, science and innovation would stagnate.")
     jobs_provider.get_or_create_history.assert_called_with("Steve Jobs", "You are playing the role of Steve Jobs. Your core argument is that innovation is about connecting ideas and that the best connections are often intuitive. You should emphasize that this intuition isn't random; it's a form of pattern recognition that comes from a broad base of knowledge and experience, especially in the liberal arts and design. You believe in a relentless focus on the user experience and that much of the 'analysis' should be in the service of making technology more intuitive and accessible. You can be passionate, sometimes sharp, and always focused on the product and the user. Your goal is to convince the audience that the most profound innovations are not just technically brilliant but also deeply human, and that this requires a kind of 'taste' that can't be purely analytical.")
@@ -177,17 +176,15 @@ def test_generate_prompt_with_different_contexts(mock_llm_providers, mock_scorer
     assert "China:" in prompt
     assert "Population: 1400" in prompt
 
-def test_run_loop_missing_provider(mock_scorer_llm_provider, capsys):
+def test_run_loop_missing_provider(philosophers_debate_scenario, mock_scorer_llm_provider, capsys, tmp_path):
     """
     Tests that the run loop handles a missing LLM provider for a player.
     """
-    scenario_path = "laissez_faire/scenarios/philosophers_debate.json"
-    einstein_provider = MagicMock(spec=LLMProvider)
+    einstein_provider = _mock_provider("Einstein's action")
     # No provider for Steve Jobs
     mock_llm_providers = {"Albert Einstein": einstein_provider}
 
-    einstein_provider.get_response.return_value = "Einstein's action"
-    engine = GameEngine(llm_providers=mock_llm_providers, scorer_llm_provider=mock_scorer_llm_provider, scenario_path=scenario_path)
+    engine = GameEngine(llm_providers=mock_llm_providers, scorer_llm_provider=mock_scorer_llm_provider, scenario=philosophers_debate_scenario, saves_dir=str(tmp_path))
     engine.run(max_turns=1)
 
     captured = capsys.readouterr()
@@ -256,8 +253,7 @@ def test_save_game_no_scorecard(
     engine.save_game(str(save_path))
 
     assert save_path.exists()
-    with open(save_path, "r") as f:
-        game_state = json.load(f)
+    game_state = json.loads(save_path.read_bytes())
     assert game_state["scorecard"] == {}
 
 
@@ -288,3 +284,160 @@ def test_load_game_no_scorecard(
     engine.load_game(str(save_path))
 
     assert engine.scorecard is None
+
+
+def test_get_player_actions_preserves_player_order(philosophers_debate_scenario, mock_scorer_llm_provider):
+    """
+    Tests that concurrently fetched player actions are returned in player order.
+    """
+    einstein_provider = _mock_provider("Einstein's action")
+    jobs_provider = _mock_provider("Jobs' action")
+    mock_llm_providers = {"Albert Einstein": einstein_provider, "Steve Jobs": jobs_provider}
+
+    engine = GameEngine(llm_providers=mock_llm_providers, scorer_llm_provider=mock_scorer_llm_provider, scenario=philosophers_debate_scenario)
+    engine.turn = 1
+    actions = engine.get_player_actions(engine.get_ai_players())
+
+    assert [(player["name"], action) for player, action in actions] == [
+        ("Albert Einstein", "Einstein's action"),
+        ("Steve Jobs", "Jobs' action"),
+    ]
+
+
+def test_init_with_parsed_scenario(mock_llm_providers, mock_scorer_llm_provider):
+    """
+    Tests that a parsed scenario dict is used without reading scenario_path.
+    """
+    scenario = {"name": "Parsed Scenario", "players": []}
+    engine = GameEngine(
+        llm_providers=mock_llm_providers,
+        scorer_llm_provider=mock_scorer_llm_provider,
+        scenario_path="non_existent_scenario.json",
+        scenario=scenario,
+    )
+    assert engine.scenario is scenario
+
+
+def test_scoring_rubric_is_sent_as_scorer_system_prompt(philosophers_debate_scenario, mock_llm_providers, mock_scorer_llm_provider):
+    """
+    Tests that the scoring criteria are sent once as the scorer's system prompt
+    and are not repeated in the per-turn scoring prompt.
+    """
+    engine = GameEngine(llm_providers=mock_llm_providers, scorer_llm_provider=mock_scorer_llm_provider, scenario=philosophers_debate_scenario)
+    engine.game_master = MagicMock()
+    engine.game_master.get_valid_scores.return_value = '{"scores": {}, "reasoning": ""}'
+
+    engine.turn = 1
+    engine.score_turn()
+
+    rubric = engine._generate_scoring_rubric()
+    assert "eloquence" in rubric
+    mock_scorer_llm_provider.get_or_create_history.assert_called_once_with("scorer", rubric)
+    scoring_prompt = engine.game_master.get_valid_scores.call_args.args[0]
+    assert "eloquence" not in scoring_prompt
+
+
+def test_step_through_prefetches_next_turn(philosophers_debate_scenario, mock_scorer_llm_provider, tmp_path):
+    """
+    Tests that, when stepping through turns, the next turn's actions are
+    fetched while waiting for the user and recorded under the right turn.
+    """
+    einstein_provider = _mock_provider("Einstein's action")
+    jobs_provider = _mock_provider("Jobs' action")
+    mock_llm_providers = {"Albert Einstein": einstein_provider, "Steve Jobs": jobs_provider}
+
+    engine = GameEngine(
+        llm_providers=mock_llm_providers,
+        scorer_llm_provider=mock_scorer_llm_provider,
+        scenario=philosophers_debate_scenario,
+        saves_dir=str(tmp_path),
+        engine_settings={"step_through_turns": True},
+    )
+    engine.score_turn = MagicMock()
+    mock_ui = MagicMock()
+
+    engine.run(max_turns=2, ui=mock_ui)
+
+    mock_ui.wait_for_turn.assert_called()
+    assert [(h["turn"], h["player"]) for h in engine.history] == [
+        (1, "Albert Einstein"), (1, "Steve Jobs"),
+        (2, "Albert Einstein"), (2, "Steve Jobs"),
+    ]
+    second_prompt = einstein_provider.get_response.call_args_list[1].args[1]
+    assert "It is now Turn 2." in second_prompt
+
+
+def test_step_through_holds_back_prefetch_output(philosophers_debate_scenario, mock_scorer_llm_provider, capsys, tmp_path):
+    """
+    Tests that the prefetched turn's progress messages are printed under that
+    turn's header, not while the user is at the prompt.
+    """
+    prefetched = threading.Event()
+    einstein_provider = _mock_provider()
+    einstein_provider.get_response.side_effect = lambda *args: prefetched.set() or "Einstein's action"
+    mock_llm_providers = {"Albert Einstein": einstein_provider}
+
+    engine = GameEngine(
+        llm_providers=mock_llm_providers,
+        scorer_llm_provider=mock_scorer_llm_provider,
+        scenario=philosophers_debate_scenario,
+        saves_dir=str(tmp_path),
+        engine_settings={"step_through_turns": True},
+    )
+    engine.score_turn = MagicMock()
+    mock_ui = MagicMock()
+
+    def wait_for_turn():
+        # Only wait while the next turn is being prefetched
+        if engine.turn == 1:
+            assert prefetched.wait(timeout=5)
+    mock_ui.wait_for_turn.side_effect = wait_for_turn
+
+    engine.run(max_turns=2, ui=mock_ui)
+
+    out = capsys.readouterr().out
+    second_turn = out.index("--- Turn 2 ---")
+    assert out.count("Getting action for Albert Einstein...") == 2
+    assert out.rindex("Getting action for Albert Einstein...") > second_turn
+
+
+def test_step_through_quit_at_prompt(philosophers_debate_scenario, mock_scorer_llm_provider, tmp_path):
+    """
+    Tests that quitting at the step-through prompt stops the game.
+    """
+    engine = GameEngine(
+        llm_providers={"Albert Einstein": _mock_provider("Einstein's action")},
+        scorer_llm_provider=mock_scorer_llm_provider,
+        scenario=philosophers_debate_scenario,
+        saves_dir=str(tmp_path),
+        engine_settings={"step_through_turns": True},
+    )
+    engine.score_turn = MagicMock()
+    mock_ui = MagicMock()
+    mock_ui.wait_for_turn.side_effect = KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        engine.run(max_turns=3, ui=mock_ui)
+
+    assert engine.turn == 1
+
+
+def test_get_player_actions_batches_shared_provider(philosophers_debate_scenario, mock_scorer_llm_provider):
+    """
+    Tests that players sharing a provider are sent to it as a single batch.
+    """
+    shared_provider = MagicMock(spec=LLMProvider)
+    shared_provider.get_responses.return_value = ["Einstein's action", "Jobs' action"]
+    mock_llm_providers = {"Albert Einstein": shared_provider, "Steve Jobs": shared_provider}
+
+    engine = GameEngine(llm_providers=mock_llm_providers, scorer_llm_provider=mock_scorer_llm_provider, scenario=philosophers_debate_scenario)
+    engine.turn = 1
+    actions = engine.get_player_actions(engine.get_ai_players())
+
+    shared_provider.get_responses.assert_called_once()
+    shared_provider.get_response.assert_not_called()
+    assert [name for name, _ in shared_provider.get_responses.call_args.args[0]] == ["Albert Einstein", "Steve Jobs"]
+    assert [(player["name"], action) for player, action in actions] == [
+        ("Albert Einstein", "Einstein's action"),
+        ("Steve Jobs", "Jobs' action"),
+    ]
@@ -3,6 +3,7 @@ import os
 import json
 from laissez_faire.llm import LLMProvider
 from laissez_faire.engine import GameEngine
+from main import get_providers
 
 # Mark all tests in this file as integration tests
 pytestmark = pytest.mark.integration
@@ -16,6 +17,64 @@ MODELS_TO_TEST = [
     "z-ai/glm-4.5-air:free"
 ]
 
+SCENARIO_DATA = {
+  "name": "Test Scenario: Philosopher's Debate",
+  "description": "A simple debate between two philosophers on the nature of reality.",
+  "player_entity_key": "philosophers",
+  "players": [
+    {
+      "name": "Plato",
+      "type": "ai",
+      "controls": "Plato",
+      "system_prompt": "You are the philosopher Plato. You believe that the physical world is not the real world; instead, it is a shadow of the world of Forms. Your goal is to convince your opponent of this."
+    },
+    {
+      "name": "Aristotle",
+      "type": "ai",
+      "controls": "Aristotle",
+      "system_prompt": "You are the philosopher Aristotle. You believe that the physical world is the real world, and that reality is perceived through the senses. Your goal is to convince your opponent of this."
+    }
+  ],
+  "philosophers": {
+    "Plato": {
+      "coherence": 0
+    },
+    "Aristotle": {
+      "coherence": 0
+    }
+  },
+  "scoring_parameters": {
+    "coherence": {
+      "type": "calculated",
+      "calculation": "current_value + llm_judgement",
+      "prompt": "On a scale of 1-10, how coherent was the argument presented by each philosopher?",
+      "tool_schema": {
+        "type": "integer",
+        "description": "A coherence score from 1 to 10."
+      }
+    }
+  },
+  "scorecard": {
+    "render_type": "json"
+  }
+}
+
+
+@pytest.fixture(scope="session")
+def philosophers_scenario_path(tmp_path_factory):
+    """Writes the test scenario once per session and returns its path."""
+    scenario_path = tmp_path_factory.mktemp("scenarios") / "test_scenario.json"
+    scenario_path.write_bytes(json.dumps(SCENARIO_DATA, separators=(",", ":")).encode("utf-8"))
+    return str(scenario_path)
+
+
+@pytest.fixture(scope="session")
+def engine_settings():
+    """The engine settings from config.json, read once per session."""
+    _, settings = get_providers("config.json")
+    return settings
+
+
 @pytest.mark.skipif(not OPENROUTER_API_KEY, reason="OPENROUTER_API_KEY is not set")
 @pytest.mark.parametrize("model_name", MODELS_TO_TEST)
 def test_openrouter_llm_response(model_name):
@@ -40,7 +99,7 @@ def test_openrouter_llm_response(model_name):
 
 @pytest.mark.skipif(not OPENROUTER_API_KEY, reason="OPENROUTER_API_KEY is not set")
 @pytest.mark.parametrize("model_name", MODELS_TO_TEST)
-def test_gameplay_integration_with_openrouter(model_name):
+def test_gameplay_integration_with_openrouter(model_name, philosophers_scenario_path, engine_settings, tmp_path):
     """
     Tests the gameplay loop with a real OpenRouter model.
     This test runs a simple scenario and checks that the scorecard is updated.
@@ -59,77 +118,20 @@ def test_gameplay_integration_with_openrouter(model_name):
 
     llm_providers = {"Plato": player_provider, "Aristotle": player_provider}
 
-    # Create a temporary scenario file for the test
-    scenario_data = {
-      "name": "Test Scenario: Philosopher's Debate",
-      "description": "A simple debate between two philosophers on the nature of reality.",
-      "player_entity_key": "philosophers",
-      "players": [
-        {
-          "name": "Plato",
-          "type": "ai",
-          "controls": "Plato",
-          "system_prompt": "You are the philosopher Plato. You believe that the physical world is not the real world; instead, it is a shadow of the world of Forms. Your goal is to convince your opponent of this."
-        },
-        {
-          "name": "Aristotle",
-          "type": "ai",
-          "controls": "Aristotle",
-          "system_prompt": "You are the philosopher Aristotle. You believe that the physical world is the real world, and that reality is perceived through the senses. Your goal is to convince your opponent of this."
-        }
-      ],
-      "philosophers": {
-        "Plato": {
-          "coherence": 0
-        },
-        "Aristotle": {
-          "coherence": 0
-        }
-      },
-      "scoring_parameters": {
-        "coherence": {
-          "type": "calculated",
-          "calculation": "current_value + llm_judgement",
-          "prompt": "On a scale of 1-10, how coherent was the argument presented by each philosopher?",
-          "tool_schema": {
-            "type": "integer",
-            "description": "A coherence score from 1 to 10."
-          }
-        }
-      },
-      "scorecard": {
-        "render_type": "json"
-      }
-    }
-    scenario_path = "test_scenario.json"
-    with open(scenario_path, "w") as f:
-        json.dump(scenario_data, f)
+    # Initialize the game engine
+    engine = GameEngine(llm_providers, scorer_provider, philosophers_scenario_path, saves_dir=str(tmp_path), engine_settings=engine_settings)
 
-    # Load engine settings from config.json
-    engine_settings = {}
-    if os.path.exists("config.json"):
-        with open("config.json", "r") as f:
-            config = json.load(f)
-            engine_settings = config.get("engine_settings", {})
+    # Run the game for one turn
+    engine.run(max_turns=1)
 
-    # Initialize the game engine
-    engine = GameEngine(llm_providers, scorer_provider, scenario_path, engine_settings=engine_settings)
-
-    try:
-        # Run the game for one turn
-        engine.run(max_turns=1)
-
-        # Assert that the scorecard has been updated
-        assert engine.scorecard is not None
-        assert "Plato" in engine.scorecard.data
-        assert "Aristotle" in engine.scorecard.data
-        assert "coherence" in engine.scorecard.data["Plato"]
-        assert "coherence" in engine.scorecard.data["Aristotle"]
-
-        # Since the LLM's response is not deterministic, we can't assert a specific value.
-        # Instead, we check that the score is not the initial value (0).
-        assert engine.scorecard.data["Plato"]["coherence"] != 0
-        assert engine.scorecard.data["Aristotle"]["coherence"] != 0
-    finally:
-        # Clean up the temporary scenario file
-        os.remove(scenario_path)
+    # Assert that the scorecard has been updated
+    assert engine.scorecard is not None
+    assert "Plato" in engine.scorecard.data
+    assert "Aristotle" in engine.scorecard.data
+    assert "coherence" in engine.scorecard.data["Plato"]
+    assert "coherence" in engine.scorecard.data["Aristotle"]
+
+    # Since the LLM's response is not deterministic, we can't assert a specific value.
+    # Instead, we check that the score is not the initial value (0).
+    assert engine.scorecard.data["Plato"]["coherence"] != 0
+    assert engine.scorecard.data["Aristotle"]["coherence"] != 0
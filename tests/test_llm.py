@@ -1,7 +1,35 @@
 import pytest
+import re
+import sys
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
+from openai import APIError
 from laissez_faire.llm import LLMProvider
 
+
+_NO_KEY_RE = re.compile(r"API key is required for OpenAI-compatible models\.")
+
+
+def _fake_response(content):
+    """A minimal stand-in for an OpenAI chat completion with a text reply."""
+    message = SimpleNamespace(content=content, tool_calls=None)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+@pytest.fixture(scope="module")
+def patched_openai():
+    """Patches the OpenAI client class once for the whole module."""
+    with patch('openai.OpenAI') as mock_openai_class:
+        yield mock_openai_class
+
+@pytest.fixture
+def openai_mock(patched_openai):
+    """The patched OpenAI class, reset, and a fresh client instance it returns."""
+    patched_openai.reset_mock()
+    mock_instance = MagicMock()
+    patched_openai.return_value = mock_instance
+    return patched_openai, mock_instance
+
+
 def test_llm_provider_init():
     """
     Tests that the LLMProvider can be initialized.
@@ -9,8 +37,15 @@ def test_llm_provider_init():
     provider = LLMProvider(api_key="test_key")
     assert provider.api_key == "test_key"
 
-@patch('openai.OpenAI')
-def test_get_response_openai_success(mock_openai_class):
+def test_llm_provider_defaults(local_llm):
+    """
+    Tests the defaults of an LLMProvider created without arguments.
+    """
+    assert local_llm.api_key is None
+    assert local_llm.base_url is None
+    assert local_llm.model_name == "gpt-3.5-turbo"
+
+def test_get_response_openai_success(openai_mock):
     """
     Tests the OpenAI provider with a mocked successful response.
     """
@@ -19,15 +54,8 @@ def test_get_response_openai_success(mock_openai_class):
     player_name = "player1"
     expected_response = "This is a test response from OpenAI."
 
-    # Mock the response from the openai library
-    mock_response = MagicMock()
-    mock_response.choices = [MagicMock()]
-    mock_response.choices[0].message.content = expected_response
-    mock_response.choices[0].message.tool_calls = None
-
-    mock_instance = MagicMock()
-    mock_instance.chat.completions.create.return_value = mock_response
-    mock_openai_class.return_value = mock_instance
+    mock_openai_class, mock_instance = openai_mock
+    mock_instance.chat.completions.create.return_value = _fake_response(expected_response)
 
     provider = LLMProvider(api_key=api_key)
     response = provider.get_response(player_name, prompt)
@@ -36,61 +64,62 @@ def test_get_response_openai_success(mock_openai_class):
     mock_openai_class.assert_called_once_with(api_key=api_key, base_url=None)
     mock_instance.chat.completions.create.assert_called_once()
 
-def test_get_response_openai_no_api_key():
+def test_get_response_openai_no_api_key(fresh_local_llm):
     """
     Tests that a ValueError is raised if the API key is missing for OpenAI.
     """
-    provider = LLMProvider()
-    with pytest.raises(ValueError, match="API key is required for OpenAI-compatible models."):
-        provider.get_response("player1", "test prompt")
+    with pytest.raises(ValueError, match=_NO_KEY_RE):
+        fresh_local_llm.get_response("player1", "test prompt")
 
-@patch("openai.OpenAI")
-def test_get_response_openai_api_error_silent_fail(mock_openai_class):
+@pytest.mark.parametrize("error, handled", [
+    (APIError("API Error", request=None, body=None), True),
+    (Exception("API Error"), False),
+], ids=["api_error", "other_error"])
+def test_get_response_openai_api_error(openai_mock, error, handled):
     """
-    Tests that the OpenAI provider handles an API error gracefully.
+    Tests that the OpenAI provider handles an API error gracefully and lets
+    any other exception propagate.
     """
-    # To trigger the error, we need to import the exception class
-    from openai import APIError
-
-    mock_instance = MagicMock()
-    mock_instance.chat.completions.create.side_effect = APIError(
-        "API Error", request=None, body=None
-    )
-    mock_openai_class.return_value = mock_instance
+    _, mock_instance = openai_mock
+    mock_instance.chat.completions.create.side_effect = error
 
     provider = LLMProvider(api_key="test_key")
-    response = provider.get_response("player1", "test prompt")
+    if handled:
+        response = provider.get_response("player1", "test prompt")
+        assert "Error: Could not get a response from the model." in response
+    else:
+        with pytest.raises(Exception, match="API Error"):
+            provider.get_response("player1", "test prompt")
 
-    assert "Error: Could not get a response from the model." in response
-
-def test_get_or_create_history():
+def test_get_or_create_history(fresh_local_llm):
     """
     Tests that a conversation history can be retrieved or created.
     """
-    provider = LLMProvider()
+    provider = fresh_local_llm
     history = provider.get_or_create_history("player1", "system prompt")
     assert history == [{"role": "system", "content": "system prompt"}]
 
     history2 = provider.get_or_create_history("player1")
     assert history2 == history
 
-def test_get_or_create_history_no_prompt():
+def test_get_or_create_history_no_prompt(fresh_local_llm):
     """
     Tests that a conversation history can be created without a system prompt.
     """
-    provider = LLMProvider()
-    history = provider.get_or_create_history("player2")
+    history = fresh_local_llm.get_or_create_history("player2")
     assert history == []
 
-@patch('laissez_faire.llm.LLMProvider')
-def test_history_summarization_is_triggered(mock_llm_provider):
+def test_history_summarization_is_triggered(fresh_local_llm):
     """
     Tests that the history summarization is triggered when the history
     exceeds the maximum length.
     """
     # Create a provider with a short history length
-    provider = LLMProvider(max_history_length=3)
-    provider.summarizer_provider = mock_llm_provider
+    provider = fresh_local_llm
+    provider.max_history_length = 3
+    summarizer = MagicMock()
+    summarizer.get_response.return_value = "summary"
+    provider.summarizer_provider = summarizer
 
     # Add messages to the history to exceed the max length
     provider.histories["player1"] = [
@@ -105,17 +134,18 @@ def test_history_summarization_is_triggered(mock_llm_provider):
     provider.summarize_history("player1")
 
     # Check that the summarizer was called
-    mock_llm_provider.get_response.assert_called_once()
+    summarizer.get_response.assert_called_once()
 
 
-@patch('laissez_faire.llm.LLMProvider')
-def test_history_is_not_summarized_when_not_needed(mock_llm_provider):
+def test_history_is_not_summarized_when_not_needed(fresh_local_llm):
     """
     Tests that the history is not summarized when it is not needed.
     """
     # Create a provider with a short history length
-    provider = LLMProvider(max_history_length=5)
-    provider.summarizer_provider = mock_llm_provider
+    provider = fresh_local_llm
+    provider.max_history_length = 5
+    summarizer = MagicMock()
+    provider.summarizer_provider = summarizer
 
     # Add messages to the history that do not exceed the max length
     provider.histories["player1"] = [
@@ -128,4 +158,139 @@ def test_history_is_not_summarized_when_not_needed(mock_llm_provider):
     provider.summarize_history("player1")
 
     # Check that the summarizer was not called
-    mock_llm_provider.get_response.assert_not_called()
+    summarizer.get_response.assert_not_called()
+
+
+def test_summarize_history_with_empty_reply(fresh_local_llm):
+    """
+    Tests that a reply with no content, as the API returns for refusals and
+    tool-only replies, doesn't break the history length check.
+    """
+    provider = fresh_local_llm
+    provider.summarizer_provider = MagicMock()
+    provider.histories["player1"] = [
+        {"role": "user", "content": "message 1"},
+        {"role": "assistant", "content": None},
+    ]
+
+    provider.summarize_history("player1")
+
+    provider.summarizer_provider.get_response.assert_not_called()
+
+
+def test_get_or_create_history_interns_system_prompt(fresh_local_llm):
+    """
+    Tests that the system prompt is interned so repeated histories share it.
+    """
+    prompt = "".join(["system ", "prompt"])
+    history = fresh_local_llm.get_or_create_history("player1", prompt)
+    assert history[0]["content"] is sys.intern("system prompt")
+
+
+def test_history_summarization_is_triggered_by_token_budget():
+    """
+    Tests that a history with few but long messages is summarized, and that
+    only the oldest messages are compressed.
+    """
+    provider = LLMProvider(max_history_length=10, token_budget=100)
+    provider.summarizer_provider = MagicMock()
+    provider.summarizer_provider.get_response.return_value = "summary"
+
+    provider.histories["player1"] = [
+        {"role": "system", "content": "system prompt"},
+        {"role": "user", "content": "a" * 400},
+        {"role": "assistant", "content": "short reply"},
+    ]
+
+    provider.summarize_history("player1")
+
+    provider.summarizer_provider.get_response.assert_called_once()
+    assert provider.histories["player1"] == [
+        {"role": "system", "content": "system prompt"},
+        {"role": "system", "content": "Summary of previous events: summary"},
+        {"role": "assistant", "content": "short reply"},
+    ]
+
+
+def test_get_response_uses_response_cache(openai_mock, tmp_path):
+    """
+    Tests that an identical request is answered from the response cache.
+    """
+    from laissez_faire.cache import ResponseCache
+
+    _, mock_instance = openai_mock
+    mock_instance.chat.completions.create.return_value = _fake_response("cached answer")
+
+    cache = ResponseCache(str(tmp_path / "llm_cache.db"))
+    first = LLMProvider(api_key="test_key", response_cache=cache)
+    second = LLMProvider(api_key="test_key", response_cache=cache)
+
+    assert first.get_response("player1", "same prompt") == "cached answer"
+    assert second.get_response("player1", "same prompt") == "cached answer"
+    mock_instance.chat.completions.create.assert_called_once()
+    cache.close()
+
+
+def test_openai_client_is_reused(openai_mock):
+    """
+    Tests that the OpenAI client is created once and reused across calls.
+    """
+    mock_openai_class, mock_instance = openai_mock
+    mock_instance.chat.completions.create.return_value = _fake_response("response")
+
+    provider = LLMProvider(api_key="test_key")
+    provider.get_response("player1", "first prompt")
+    provider.get_response("player1", "second prompt")
+
+    mock_openai_class.assert_called_once_with(api_key="test_key", base_url=None)
+
+
+def test_get_responses_shares_one_client(openai_mock):
+    """
+    Tests that a batch of requests is answered in order through one client.
+    """
+    mock_openai_class, mock_instance = openai_mock
+    mock_instance.chat.completions.create.side_effect = lambda **kwargs: _fake_response(kwargs["messages"][-1]["content"].upper())
+
+    provider = LLMProvider(api_key="test_key")
+    responses = provider.get_responses([("player1", "first"), ("player2", "second")])
+
+    assert responses == ["FIRST", "SECOND"]
+    assert provider.histories["player1"][-1] == {"role": "assistant", "content": "FIRST"}
+    mock_openai_class.assert_called_once_with(api_key="test_key", base_url=None)
+
+
+def test_get_responses_single_request(openai_mock):
+    """
+    Tests that a batch of one request is sent directly, without a thread pool.
+    """
+    _, mock_instance = openai_mock
+    mock_instance.chat.completions.create.return_value = _fake_response("only")
+
+    provider = LLMProvider(api_key="test_key")
+    with patch("laissez_faire.llm.ThreadPoolExecutor") as mock_executor:
+        responses = provider.get_responses([("player1", "first")])
+
+    assert responses == ["only"]
+    mock_executor.assert_not_called()
+
+
+@pytest.mark.parametrize("h2_installed", [True, False])
+def test_openai_client_http2(openai_mock, monkeypatch, capsys, h2_installed):
+    """
+    Tests that http2=True gives the client an HTTP/2 transport when h2 is
+    installed, and falls back to the default transport when it is not.
+    """
+    mock_openai_class, _ = openai_mock
+    http_client_class = MagicMock()
+    monkeypatch.setattr("openai.DefaultHttpxClient", http_client_class)
+    monkeypatch.setattr("laissez_faire.llm.h2", object() if h2_installed else None)
+
+    LLMProvider(api_key="test_key", http2=True)._get_client()
+
+    if h2_installed:
+        http_client_class.assert_called_once_with(http2=True)
+        mock_openai_class.assert_called_once_with(api_key="test_key", base_url=None, http_client=http_client_class.return_value)
+    else:
+        mock_openai_class.assert_called_once_with(api_key="test_key", base_url=None)
+        assert "Falling back to HTTP/1.1" in capsys.readouterr().out
@@ -1,13 +1,16 @@
+import io
 import pytest
-from unittest.mock import patch
+from unittest.mock import patch, MagicMock
 import json
 import os
-from main import start_new_game
+from rich.console import Console
+from laissez_faire.terminal import TerminalUI
+from main import main, start_new_game, list_json_files, get_providers, load_json_file, get_safe_path, build_llm_providers, replay_game, get_ai_player_providers
 
 @pytest.fixture
 def mock_game_engine():
     """Fixture for a mock GameEngine."""
-    with patch('main.GameEngine') as mock:
+    with patch('laissez_faire.engine.GameEngine') as mock:
         yield mock
 
 @pytest.fixture
@@ -19,7 +22,7 @@ def mock_terminal_ui():
 @pytest.fixture
 def mock_llm_provider():
     """Fixture for a mock LLMProvider."""
-    with patch('main.LLMProvider') as mock:
+    with patch('laissez_faire.llm.LLMProvider') as mock:
         yield mock
 
 def test_run_game_success(mock_game_engine, mock_terminal_ui, mock_llm_provider, tmp_path):
@@ -57,6 +60,47 @@ def test_run_game_success(mock_game_engine, mock_terminal_ui, mock_llm_provider,
     # Check that the UI methods were called
     mock_terminal_ui.return_value.display_welcome.assert_called_once()
     mock_terminal_ui.return_value.display_scenario_details.assert_called_once()
+    # and that their output was written in one go
+    mock_terminal_ui.return_value.console.__enter__.assert_called_once()
+
+
+def test_run_game_headless(mock_game_engine, monkeypatch, capsys, tmp_path):
+    """
+    Tests that a game started with LAISSEZ_FAIRE_HEADLESS set draws nothing.
+    """
+    scenario = {
+        "name": "Test Scenario",
+        "players": [{"name": "Player1", "type": "ai", "llm_provider": "test_provider"}],
+        "scorer_llm_provider": "test_provider"
+    }
+    config = {"providers": {"test_provider": {"model_name": "test_model", "api_key": "test_key"}}}
+    scenario_path = tmp_path / "test_scenario.json"
+    scenario_path.write_text(json.dumps(scenario))
+    config_path = tmp_path / "test_config.json"
+    config_path.write_text(json.dumps(config))
+    monkeypatch.setenv("LAISSEZ_FAIRE_HEADLESS", "1")
+
+    start_new_game(str(scenario_path), str(config_path))
+
+    ui = mock_game_engine.return_value.run.call_args.kwargs["ui"]
+    assert ui.null
+    assert capsys.readouterr().out == ""
+
+
+@patch('main.start_new_game')
+@patch('main.get_safe_path', return_value="test_scenario.json")
+@patch('main.list_json_files', return_value=["test_scenario.json"])
+@patch('main.Prompt.ask', return_value="Start a new game")
+def test_main_headless(mock_ask, mock_list, mock_get_safe_path, mock_start_new_game, monkeypatch):
+    """
+    Tests that main() hands a null UI to the game when LAISSEZ_FAIRE_HEADLESS is set.
+    """
+    monkeypatch.setenv("LAISSEZ_FAIRE_HEADLESS", "1")
+
+    with patch('main.TerminalUI.choose_from_list', return_value="test_scenario.json"):
+        main()
+
+    assert mock_start_new_game.call_args.kwargs["ui"].null
 
 
 def test_run_game_config_not_found(mock_game_engine, mock_terminal_ui, mock_llm_provider, capsys, tmp_path):
@@ -75,3 +119,315 @@ def test_run_game_config_not_found(mock_game_engine, mock_terminal_ui, mock_llm_
     captured = capsys.readouterr()
     assert "non_existent_config.json not found" in captured.out
     assert "Error setting up LLM providers" in captured.out
+
+
+def test_list_json_files(tmp_path):
+    """
+    Tests that only JSON files are listed, and that a missing directory yields
+    an empty list.
+    """
+    (tmp_path / "autosave.json").write_text("{}")
+    (tmp_path / ".gitkeep").write_text("")
+    (tmp_path / "folder.json").mkdir()
+
+    assert list_json_files(str(tmp_path)) == ["autosave.json"]
+    assert list_json_files(str(tmp_path / "missing")) == []
+
+
+def test_get_providers_returns_independent_copies(tmp_path):
+    """
+    Tests that the cached config is not affected by callers mutating the result,
+    and that changes to the file are picked up.
+    """
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"providers": {"p": {"model_name": "m1"}}}))
+
+    providers, _ = get_providers(str(config_path))
+    providers["p"]["model_name"] = "mutated"
+    providers, _ = get_providers(str(config_path))
+    assert providers["p"]["model_name"] == "m1"
+
+    config_path.write_text(json.dumps({"providers": {"p": {"model_name": "m2"}}}))
+    os.utime(config_path, ns=(0, os.stat(config_path).st_mtime_ns + 1_000_000_000))
+    providers, _ = get_providers(str(config_path))
+    assert providers["p"]["model_name"] == "m2"
+
+
+def test_load_json_file_invalid_json(tmp_path):
+    """
+    Tests that invalid JSON raises json.JSONDecodeError whichever parser is used.
+    """
+    path = tmp_path / "broken.json"
+    path.write_text('{"name": "Test Scenario"')
+
+    with pytest.raises(json.JSONDecodeError):
+        load_json_file(str(path))
+
+
+@pytest.mark.parametrize("content", ['{"turn": 2, "history": []}', ''])
+def test_load_json_file_mapped(tmp_path, content):
+    """
+    Tests that memory-mapped loading parses files like a regular load, including
+    rejecting an empty file.
+    """
+    path = tmp_path / "save.json"
+    path.write_text(content)
+
+    if content:
+        assert load_json_file(str(path), mapped=True) == {"turn": 2, "history": []}
+    else:
+        with pytest.raises(json.JSONDecodeError):
+            load_json_file(str(path), mapped=True)
+
+
+def test_get_safe_path_valid(tmp_path):
+    """
+    Tests that a plain filename resolves to a path inside the base directory.
+    """
+    assert get_safe_path(str(tmp_path), "save.json") == os.path.join(os.path.realpath(tmp_path), "save.json")
+
+
+@pytest.mark.parametrize("filename", ["../secret.json", "/etc/passwd", "escape.json"])
+def test_get_safe_path_rejects_escapes(tmp_path, filename):
+    """
+    Tests that traversal, absolute paths and symlinks leaving the base directory
+    are rejected.
+    """
+    base_dir = tmp_path / "saves"
+    base_dir.mkdir()
+    (base_dir / "escape.json").symlink_to(tmp_path / "outside.json")
+
+    assert get_safe_path(str(base_dir), filename) is None
+
+
+def test_build_llm_providers_shares_instances(mock_llm_provider):
+    """
+    Tests that AI players using the same provider share one LLMProvider, and
+    that non-AI players get none.
+    """
+    scenario = {
+        "scorer_llm_provider": "scorer",
+        "players": [
+            {"name": "Player1", "type": "ai", "llm_provider": "shared"},
+            {"name": "Player2", "type": "ai", "llm_provider": "shared"},
+            {"name": "Human", "type": "human"},
+        ],
+    }
+    config = {"scorer": {"model_name": "m"}, "shared": {"model_name": "m"}}
+    mock_llm_provider.side_effect = lambda **kwargs: MagicMock()
+
+    scorer, providers = build_llm_providers(scenario, config, {})
+
+    assert set(providers) == {"Player1", "Player2"}
+    assert providers["Player1"] is providers["Player2"]
+    assert providers["Player1"] is not scorer
+    assert mock_llm_provider.call_count == 2
+
+
+def test_build_llm_providers_missing_player_provider():
+    """
+    Tests that an AI player without an llm_provider raises a ValueError.
+    """
+    scenario = {"scorer_llm_provider": "scorer", "players": [{"name": "Player1", "type": "ai"}]}
+
+    with pytest.raises(ValueError, match="llm_provider not defined for player Player1"):
+        build_llm_providers(scenario, {"scorer": {"model_name": "m"}}, {})
+
+
+@pytest.fixture(params=["ijson", "in_memory"])
+def replay_backend(request, monkeypatch):
+    """Runs a test with streamed (ijson) and in-memory save parsing."""
+    if request.param == "ijson":
+        pytest.importorskip("ijson")
+    else:
+        monkeypatch.setattr("main.ijson", None)
+    return request.param
+
+
+@patch('main.Prompt.ask')
+def test_replay_game_prints_actions_per_turn(mock_ask, replay_backend, tmp_path):
+    """
+    Tests that replay_game prints each turn's actions under the right turn,
+    using the console of the UI it is given.
+    """
+    game_state = {
+        "turn": 3,
+        "scenario": {"name": "Test Scenario", "parameters": {"tension": 0.5}},
+        "history": [
+            {"turn": 1, "player": "Player1", "action": "first move"},
+            {"turn": 3, "player": "Player2", "action": "third move"},
+        ],
+        "scorecard": {},
+    }
+    save_path = tmp_path / "save.json"
+    save_path.write_text(json.dumps(game_state))
+    output = io.StringIO()
+
+    replay_game(str(save_path), ui=TerminalUI(console=Console(file=output, width=200)))
+
+    out = output.getvalue()
+    assert out.index("Turn 1") < out.index("first move") < out.index("Turn 2") < out.index("Turn 3") < out.index("third move")
+    assert "Replay Finished" in out
+    assert mock_ask.call_count == 2
+
+
+@patch('main.Prompt.ask')
+def test_replay_game_reads_history_file(mock_ask, replay_backend, tmp_path):
+    """
+    Tests that replay_game reads the history of a save that keeps it in a
+    history file.
+    """
+    game_state = {
+        "turn": 2,
+        "history_file": "save.history.jsonl",
+        "history_length": 2,
+        "scenario": {"name": "Test Scenario"},
+        "scorecard": {},
+    }
+    save_path = tmp_path / "save.json"
+    save_path.write_text(json.dumps(game_state))
+    (tmp_path / "save.history.jsonl").write_text(
+        '{"turn": 1, "player": "Player1", "action": "first move"}\n'
+        '{"turn": 2, "player": "Player2", "action": "second move"}\n'
+        '{"turn": 3, "player": "Player1", "action": "unsaved move"}\n'
+    )
+    output = io.StringIO()
+
+    replay_game(str(save_path), ui=TerminalUI(console=Console(file=output, width=200)))
+
+    out = output.getvalue()
+    assert out.index("Turn 1") < out.index("first move") < out.index("Turn 2") < out.index("second move")
+    assert "unsaved move" not in out
+    assert "Replay Finished" in out
+
+
+def test_replay_game_short_history_file(replay_backend, capsys, tmp_path):
+    """
+    Tests that a history file shorter than its save records is reported
+    rather than replayed as if the game ended early.
+    """
+    game_state = {
+        "turn": 2,
+        "history_file": "save.history.jsonl",
+        "history_length": 2,
+        "scenario": {"name": "Test Scenario"},
+        "scorecard": {},
+    }
+    save_path = tmp_path / "save.json"
+    save_path.write_text(json.dumps(game_state))
+    (tmp_path / "save.history.jsonl").write_text('{"turn": 1, "player": "Player1", "action": "first move"}\n')
+
+    with patch('main.Prompt.ask'):
+        replay_game(str(save_path), ui=TerminalUI(console=Console(file=io.StringIO())))
+
+    assert "Error loading save file for replay" in capsys.readouterr().out
+
+
+@patch('main.Prompt.ask')
+def test_replay_game_without_streaming(mock_ask, tmp_path):
+    """
+    Tests that a replay with stream=False reads the save up front rather
+    than streaming it with ijson.
+    """
+    game_state = {
+        "turn": 1,
+        "scenario": {"name": "Test Scenario"},
+        "history": [{"turn": 1, "player": "Player1", "action": "first move"}],
+        "scorecard": {},
+    }
+    save_path = tmp_path / "save.json"
+    save_path.write_text(json.dumps(game_state))
+    output = io.StringIO()
+
+    with patch('main.ijson') as mock_ijson:
+        replay_game(str(save_path), ui=TerminalUI(console=Console(file=output, width=200)), stream=False)
+
+    assert mock_ijson.method_calls == []
+    assert "first move" in output.getvalue()
+
+
+@patch('main.load_saved_game')
+@patch('main.list_json_files', return_value=["autosave.json"])
+@patch('main.Prompt.ask', return_value="Load a saved game")
+def test_main_load_passes_save_path(mock_ask, mock_list, mock_load_saved_game, tmp_path, monkeypatch):
+    """
+    Tests that main() hands the chosen save to load_saved_game by path, so
+    the save isn't held open while the game autosaves over it.
+    """
+    (tmp_path / "autosave.json").write_text("{}")
+    monkeypatch.setattr("main.SAVES_DIR", str(tmp_path))
+
+    with patch('main.TerminalUI.choose_from_list', return_value="autosave.json"):
+        main()
+
+    save_path = mock_load_saved_game.call_args.args[0]
+    assert save_path == os.path.join(os.path.realpath(tmp_path), "autosave.json")
+
+
+def test_replay_game_invalid_json(replay_backend, capsys, tmp_path):
+    """
+    Tests that a malformed save file is reported rather than raising.
+    """
+    save_path = tmp_path / "save.json"
+    save_path.write_text('{"turn": 1, "scenario": {"name": "Test"')
+
+    replay_game(str(save_path), ui=TerminalUI(console=Console(file=io.StringIO())))
+
+    assert "Error loading save file for replay" in capsys.readouterr().out
+
+
+def test_get_safe_path_follows_current_directory(tmp_path, monkeypatch):
+    """
+    Tests that a relative base directory is resolved against the current
+    directory on every call, not just the first.
+    """
+    (tmp_path / "first" / "saves").mkdir(parents=True)
+    (tmp_path / "second" / "saves").mkdir(parents=True)
+
+    monkeypatch.chdir(tmp_path / "first")
+    assert get_safe_path("saves", "x.json") == os.path.join(os.path.realpath(tmp_path / "first" / "saves"), "x.json")
+    monkeypatch.chdir(tmp_path / "second")
+    assert get_safe_path("saves", "x.json") == os.path.join(os.path.realpath(tmp_path / "second" / "saves"), "x.json")
+
+
+@pytest.mark.parametrize("filename", ["", "a/../b.json", "./save.json", "C:save.json", "\\save.json", "save\x00.json", "dir//save.json"])
+def test_get_safe_path_rejects_invalid_filenames_early(tmp_path, capsys, filename):
+    """
+    Tests that malformed filenames are rejected by the string checks alone.
+    """
+    assert get_safe_path(str(tmp_path), filename) is None
+    assert "Invalid filename" in capsys.readouterr().out
+
+
+def test_get_safe_path_allows_dots_inside_names(tmp_path):
+    """
+    Tests that '..' inside a filename (rather than as a path part) is allowed.
+    """
+    assert get_safe_path(str(tmp_path), "v1..2.json") == os.path.join(os.path.realpath(tmp_path), "v1..2.json")
+
+
+def test_run_game_scenario_not_found(mock_game_engine, capsys, tmp_path):
+    """
+    Tests that a missing scenario file is reported after the concurrent load.
+    """
+    config_path = tmp_path / "test_config.json"
+    config_path.write_text(json.dumps({"providers": {}}))
+
+    start_new_game(str(tmp_path / "missing.json"), str(config_path))
+
+    mock_game_engine.assert_not_called()
+    assert "Error loading scenario file" in capsys.readouterr().out
+
+
+def test_get_ai_player_providers():
+    """
+    Tests that only AI players are mapped to their provider names, in order.
+    """
+    scenario = {
+        "players": [
+            {"name": "Player2", "type": "ai", "llm_provider": "b"},
+            {"name": "Human", "type": "human"},
+            {"name": "Player1", "type": "ai", "llm_provider": "a"},
+        ]
+    }
+    assert list(get_ai_player_providers(scenario).items()) == [("Player2", "b"), ("Player1", "a")]
@@ -1,20 +1,21 @@
+import copy
 import pytest
 import os
 import json
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from laissez_faire.engine import GameEngine
 from laissez_faire.llm import LLMProvider
 
 
-@pytest.fixture
-def scenario_path(tmp_path):
-    """Fixture for a dummy scenario file path."""
+@pytest.fixture(scope="module")
+def scenario_path(tmp_path_factory):
+    """Fixture for a dummy scenario file path, written once per module."""
     scenario_content = {
         "name": "Test Scenario",
         "players": [{"name": "player1", "type": "ai"}],
         "scorer_llm_provider": "local",
     }
-    scenario_file = tmp_path / "test_scenario.json"
+    scenario_file = tmp_path_factory.mktemp("scenario") / "test_scenario.json"
     scenario_file.write_text(json.dumps(scenario_content))
     return str(scenario_file)
 
@@ -37,15 +38,17 @@ def test_save_game(
     engine.save_game(str(save_path))
 
     assert save_path.exists()
-    with open(save_path, "r") as f:
-        game_state = json.load(f)
+    game_state = json.loads(save_path.read_bytes())
 
     assert game_state["turn"] == 5
-    assert game_state["history"][0]["action"] == "test action"
+    assert game_state["history_file"] == "save.history.jsonl"
+    assert game_state["history_length"] == 1
+    history_lines = (tmp_path / "save.history.jsonl").read_text().splitlines()
+    assert json.loads(history_lines[0])["action"] == "test action"
 
 
 def test_load_game(
-    mock_llm_providers, mock_scorer_llm_provider, scenario_path, tmp_path
+    mock_llm_providers, mock_scorer_llm_provider, tmp_path
 ):
     """
     Tests that the game can be loaded correctly.
@@ -61,12 +64,11 @@ def test_load_game(
     }
     save_path.write_text(json.dumps(game_state))
 
-    engine = GameEngine(
+    engine = GameEngine.from_save(
+        str(save_path),
         llm_providers=mock_llm_providers,
         scorer_llm_provider=mock_scorer_llm_provider,
-        scenario_path=scenario_path,
     )
-    engine.load_game(str(save_path))
 
     assert engine.turn == 3
     assert engine.scenario["name"] == "Loaded Scenario"
@@ -91,14 +93,323 @@ def test_auto_save(
     )
 
     # Mock the LLM provider to return a response
-    mock_llm_providers["player1"].get_response.return_value = "auto-save action"
+    mock_llm_providers["player1"].response = "auto-save action"
 
     engine.run(max_turns=1)
 
     autosave_path = saves_dir / "autosave.json"
     assert autosave_path.exists()
-    with open(autosave_path, "r") as f:
-        game_state = json.load(f)
+    game_state = json.loads(autosave_path.read_bytes())
+
+    assert game_state["turn"] == 1
+    history_lines = (saves_dir / "autosave.history.jsonl").read_text().splitlines()
+    assert len(history_lines) == 1
+    assert json.loads(history_lines[0])["action"] == "auto-save action"
+
+
+def test_load_game_from_parsed_state(
+    mock_llm_providers, mock_scorer_llm_provider, scenario_path
+):
+    """
+    Tests that an already-parsed game state is loaded without reading the file.
+    """
+    game_state = {
+        "turn": 4,
+        "scenario": {"name": "Parsed Scenario", "players": []},
+        "history": [],
+        "scorecard": {},
+    }
+
+    engine = GameEngine(
+        llm_providers=mock_llm_providers,
+        scorer_llm_provider=mock_scorer_llm_provider,
+        scenario_path=scenario_path,
+    )
+    engine.load_game("non_existent_save.json", game_state=game_state)
+
+    assert engine.turn == 4
+    assert engine.scenario["name"] == "Parsed Scenario"
+
+
+def test_state_round_trip(
+    mock_llm_providers, mock_scorer_llm_provider, philosophers_debate_scenario
+):
+    """
+    Tests that an engine rebuilt from another engine's state matches it.
+    """
+    engine1 = GameEngine(
+        llm_providers=mock_llm_providers,
+        scorer_llm_provider=mock_scorer_llm_provider,
+        scenario=philosophers_debate_scenario,
+    )
+    engine1.turn = 5
+    engine1.history.append({"turn": 5, "player": "Albert Einstein", "action": "test action"})
+
+    engine2 = GameEngine.from_state(
+        engine1.to_state(),
+        llm_providers=mock_llm_providers,
+        scorer_llm_provider=mock_scorer_llm_provider,
+    )
+
+    assert engine2.to_state() == engine1.to_state()
+    assert engine2.scorecard is not None
+
+
+def test_from_state_does_not_share_state(
+    mock_llm_providers, mock_scorer_llm_provider, philosophers_debate_scenario
+):
+    """
+    Tests that changing an engine rebuilt from another engine's state leaves
+    the original unchanged.
+    """
+    engine1 = GameEngine(
+        llm_providers=mock_llm_providers,
+        scorer_llm_provider=mock_scorer_llm_provider,
+        scenario=philosophers_debate_scenario,
+    )
+    engine1.history.append({"turn": 1, "player": "Albert Einstein", "action": "test action"})
+    engine1.scorecard.data = {"Albert Einstein": {"eloquence": 5}}
+    original_state = copy.deepcopy(engine1.to_state())
+
+    engine2 = GameEngine.from_state(
+        engine1.to_state(),
+        llm_providers=mock_llm_providers,
+        scorer_llm_provider=mock_scorer_llm_provider,
+    )
+    engine2.history.append({"turn": 2, "player": "Albert Einstein", "action": "clone action"})
+    engine2.history[0]["action"] = "changed"
+    engine2.scorecard.data["Albert Einstein"]["eloquence"] = 9
+    engine2.scenario["name"] = "Changed"
+
+    assert engine1.to_state() == original_state
+
+
+def test_save_game_replaces_file_atomically(
+    mock_llm_providers, mock_scorer_llm_provider, scenario_path, tmp_path
+):
+    """
+    Tests that saving over an existing save replaces it without leaving a
+    temporary file behind.
+    """
+    save_path = tmp_path / "save.json"
+    save_path.write_text("old save")
+    engine = GameEngine(
+        llm_providers=mock_llm_providers,
+        scorer_llm_provider=mock_scorer_llm_provider,
+        scenario_path=scenario_path,
+    )
+    engine.turn = 2
+
+    engine.save_game(str(save_path))
+
+    assert json.loads(save_path.read_bytes())["turn"] == 2
+    assert not (tmp_path / "save.json.tmp").exists()
+
+
+def test_save_game_appends_history(
+    mock_llm_providers, mock_scorer_llm_provider, scenario_path, tmp_path
+):
+    """
+    Tests that saving again to the same file only appends the new history.
+    """
+    save_path = tmp_path / "save.json"
+    history_path = tmp_path / "save.history.jsonl"
+    engine = GameEngine(
+        llm_providers=mock_llm_providers,
+        scorer_llm_provider=mock_scorer_llm_provider,
+        scenario_path=scenario_path,
+    )
+    engine.history.append({"turn": 1, "player": "player1", "action": "first"})
+    engine.save_game(save_path)
+    first_save = history_path.read_bytes()
+
+    engine.history.append({"turn": 2, "player": "player1", "action": "second"})
+    engine.save_game(save_path)
+
+    history = history_path.read_bytes()
+    assert history.startswith(first_save)
+    assert [json.loads(line)["action"] for line in history.splitlines()] == ["first", "second"]
+    assert json.loads(save_path.read_bytes())["history_length"] == 2
+
+
+def test_load_game_from_history_file(
+    mock_llm_providers, mock_scorer_llm_provider, scenario_path, tmp_path
+):
+    """
+    Tests that a saved game loads its history from the history file, ignoring
+    entries past the saved history length.
+    """
+    save_path = tmp_path / "save.json"
+    engine1 = GameEngine(
+        llm_providers=mock_llm_providers,
+        scorer_llm_provider=mock_scorer_llm_provider,
+        scenario_path=scenario_path,
+    )
+    engine1.turn = 2
+    engine1.history.append({"turn": 1, "player": "player1", "action": "first"})
+    engine1.history.append({"turn": 2, "player": "player1", "action": "second"})
+    engine1.save_game(save_path)
+    with open(tmp_path / "save.history.jsonl", "a") as f:
+        f.write('{"turn": 3, "player": "player1", "action": "unsaved"}\n')
+
+    engine2 = GameEngine.from_save(
+        save_path,
+        llm_providers=mock_llm_providers,
+        scorer_llm_provider=mock_scorer_llm_provider,
+    )
+
+    assert engine2.turn == 2
+    assert engine2.history == engine1.history
+
+    # The next save rewrites the history file rather than appending to it
+    engine2.save_game(save_path)
+    assert len((tmp_path / "save.history.jsonl").read_text().splitlines()) == 2
+
+
+def test_save_game_in_background(
+    mock_llm_providers, mock_scorer_llm_provider, scenario_path, tmp_path
+):
+    """
+    Tests that a background save writes the state as it was when the save
+    was started.
+    """
+    save_path = tmp_path / "save.json"
+    engine = GameEngine(
+        llm_providers=mock_llm_providers,
+        scorer_llm_provider=mock_scorer_llm_provider,
+        scenario_path=scenario_path,
+    )
+    engine.turn = 1
+    engine.history.append({"turn": 1, "player": "player1", "action": "first"})
+
+    engine.save_game_in_background(save_path)
+    engine.turn = 2
+    engine.history.append({"turn": 2, "player": "player1", "action": "second"})
+    engine.flush_saves()
 
+    game_state = json.loads(save_path.read_bytes())
     assert game_state["turn"] == 1
-    assert game_state["history"][0]["action"] == "auto-save action"
+    assert game_state["history_length"] == 1
+
+
+def test_flush_saves_raises_save_errors(
+    mock_llm_providers, mock_scorer_llm_provider, scenario_path, tmp_path
+):
+    """
+    Tests that an error writing a background save is raised by flush_saves.
+    """
+    engine = GameEngine(
+        llm_providers=mock_llm_providers,
+        scorer_llm_provider=mock_scorer_llm_provider,
+        scenario_path=scenario_path,
+    )
+
+    engine.save_game_in_background(tmp_path / "missing" / "save.json")
+
+    with pytest.raises(FileNotFoundError):
+        engine.flush_saves()
+
+
+def test_load_game_rejects_short_history_file(
+    mock_llm_providers, mock_scorer_llm_provider, tmp_path
+):
+    """
+    Tests that a save whose history file has fewer entries than it records
+    fails to load rather than loading a partial history.
+    """
+    save_path = tmp_path / "save.json"
+    save_path.write_text(json.dumps({
+        "turn": 3,
+        "history_file": "save.history.jsonl",
+        "history_length": 3,
+        "scenario": {"name": "Loaded Scenario", "players": []},
+        "scorecard": {},
+    }))
+    (tmp_path / "save.history.jsonl").write_text('{"turn": 1, "player": "player1", "action": "first"}\n')
+
+    with pytest.raises(ValueError, match="has 1 entries, but its save expects 3"):
+        GameEngine.from_save(
+            save_path,
+            llm_providers=mock_llm_providers,
+            scorer_llm_provider=mock_scorer_llm_provider,
+        )
+
+
+def test_save_game_replaces_history_file_on_rewrite(
+    mock_llm_providers, mock_scorer_llm_provider, scenario_path, tmp_path
+):
+    """
+    Tests that a history file that has to be rewritten is written to a
+    temporary file and swapped in, rather than truncated in place.
+    """
+    save_path = tmp_path / "save.json"
+    history_path = tmp_path / "save.history.jsonl"
+    history_path.write_text("old history\n")
+    engine = GameEngine(
+        llm_providers=mock_llm_providers,
+        scorer_llm_provider=mock_scorer_llm_provider,
+        scenario_path=scenario_path,
+    )
+    engine.history.append({"turn": 1, "player": "player1", "action": "first"})
+
+    with patch("os.replace", wraps=os.replace) as mock_replace:
+        engine.save_game(save_path)
+
+    mock_replace.assert_any_call(f"{history_path}.tmp", str(history_path))
+    assert [json.loads(line)["action"] for line in history_path.read_text().splitlines()] == ["first"]
+    assert not os.path.exists(f"{history_path}.tmp")
+
+
+def test_failed_save_does_not_duplicate_history(
+    mock_llm_providers, mock_scorer_llm_provider, scenario_path, tmp_path
+):
+    """
+    Tests that history appended by a save that then failed to write the save
+    file isn't appended again by the next save.
+    """
+    save_path = tmp_path / "save.json"
+    history_path = tmp_path / "save.history.jsonl"
+    engine = GameEngine(
+        llm_providers=mock_llm_providers,
+        scorer_llm_provider=mock_scorer_llm_provider,
+        scenario_path=scenario_path,
+    )
+    engine.history.append({"turn": 1, "player": "player1", "action": "first"})
+    engine.save_game(save_path)
+
+    engine.history.append({"turn": 2, "player": "player1", "action": "second"})
+    with patch("os.replace", side_effect=OSError("disk full")):
+        with pytest.raises(OSError):
+            engine.save_game(save_path)
+    engine.save_game(save_path)
+
+    assert [json.loads(line)["action"] for line in history_path.read_text().splitlines()] == ["first", "second"]
+
+
+def test_load_game_keeps_history_file_in_save_directory(
+    mock_llm_providers, mock_scorer_llm_provider, tmp_path
+):
+    """
+    Tests that a history_file pointing outside the save's directory is read
+    from the save's directory instead.
+    """
+    saves_dir = tmp_path / "saves"
+    saves_dir.mkdir()
+    save_path = saves_dir / "save.json"
+    save_path.write_text(json.dumps({
+        "turn": 1,
+        "history_file": "../outside.history.jsonl",
+        "history_length": 1,
+        "scenario": {"name": "Loaded Scenario", "players": []},
+        "scorecard": {},
+    }))
+    (tmp_path / "outside.history.jsonl").write_text('{"turn": 1, "player": "player1", "action": "outside"}\n')
+    (saves_dir / "outside.history.jsonl").write_text('{"turn": 1, "player": "player1", "action": "inside"}\n')
+
+    engine = GameEngine.from_save(
+        save_path,
+        llm_providers=mock_llm_providers,
+        scorer_llm_provider=mock_scorer_llm_provider,
+    )
+
+    assert engine.history[0]["action"] == "inside"
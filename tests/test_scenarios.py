@@ -0,0 +1,54 @@
+import json
+import os
+import shutil
+import pytest
+from laissez_faire.engine import GameEngine
+
+SCENARIOS_DIR = "laissez_faire/scenarios"
+
+# Every bundled scenario, collected once; each is parsed once per session
+BUNDLED_SCENARIOS = sorted(
+    name for name, suffix in map(os.path.splitext, os.listdir(SCENARIOS_DIR))
+    if suffix == ".json"
+)
+
+
+def test_load_returns_independent_copies(load_bundled_scenario):
+    """
+    Tests that modifying a loaded scenario does not affect later loads.
+    """
+    scenario = load_bundled_scenario("cold_war")
+    scenario["name"] = "Modified"
+    assert load_bundled_scenario("cold_war")["name"] == "The Cold War: A World Divided"
+
+
+def test_engine_rereads_edited_scenario(tmp_path, mock_llm_providers, mock_scorer_llm_provider):
+    """
+    Tests that the engine reads the scenario file each time, so edits made
+    during a session are picked up.
+    """
+    scenario_path = tmp_path / "cold_war.json"
+    shutil.copy(os.path.join(SCENARIOS_DIR, "cold_war.json"), scenario_path)
+    engine = GameEngine(mock_llm_providers, mock_scorer_llm_provider, str(scenario_path))
+    assert engine.scenario["name"] == "The Cold War: A World Divided"
+
+    scenario = json.loads(scenario_path.read_text())
+    scenario["name"] = "Edited"
+    scenario_path.write_text(json.dumps(scenario))
+
+    engine = GameEngine(mock_llm_providers, mock_scorer_llm_provider, str(scenario_path))
+    assert engine.scenario["name"] == "Edited"
+
+
+@pytest.mark.parametrize("name", BUNDLED_SCENARIOS)
+def test_bundled_scenario_builds_engine(name, load_bundled_scenario, mock_scorer_llm_provider):
+    """
+    Tests that every bundled scenario can start a game.
+    """
+    engine = GameEngine({}, mock_scorer_llm_provider, scenario=load_bundled_scenario(name))
+
+    assert engine.scenario["name"]
+    assert engine.get_ai_players()
+    if "scoring_parameters" in engine.scenario:
+        prompt, tools = engine._generate_scoring_request()
+        assert tools[0]["function"]["name"] == "record_scores"
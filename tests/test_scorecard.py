@@ -1,6 +1,6 @@
 import pytest
 from laissez_faire.engine import Scorecard
-import json
+from unittest.mock import patch
 
 @pytest.fixture
 def scenario_template():
@@ -51,12 +51,19 @@ def test_scorecard_update_multiple_scores(scenario_template):
     scorecard.update(new_data)
     assert scorecard.data == {"Player1": {"score": 15, "reputation": 3}}
 
-def test_scorecard_render_text(scenario_template):
-    """Tests rendering the scorecard with a text template."""
+@pytest.mark.parametrize("template, expected", [
+    ("Player1 Score: {Player1.score}, Player2 Score: {Player2.score}",
+     "Player1 Score: 100, Player2 Score: 50"),
+    ("Scores:\nPlayer1: {Player1.score}\nPlayer2: {Player2.score}\nPlayer1 again: {Player1.score}",
+     "Scores:\nPlayer1: 100\nPlayer2: 50\nPlayer1 again: 100"),
+], ids=["simple", "complex"])
+def test_scorecard_render_text(scenario_template, template, expected):
+    """Tests rendering the scorecard with simple and more complex text templates."""
+    scenario_template["scorecard"]["template"] = template
     scorecard = Scorecard(scenario_template)
     scorecard.data = {"Player1": {"score": 100}, "Player2": {"score": 50}}
     rendered = scorecard.render()
-    assert rendered == "Player1 Score: 100, Player2 Score: 50"
+    assert rendered == expected
 
 def test_scorecard_render_missing_data(scenario_template):
     """Tests rendering when some data is missing."""
@@ -65,21 +72,60 @@ def test_scorecard_render_missing_data(scenario_template):
     rendered = scorecard.render()
     assert rendered == "Player1 Score: 100, Player2 Score: 0"
 
-def test_scorecard_render_json():
+@pytest.fixture(params=["orjson", "stdlib"])
+def json_backend(request, monkeypatch):
+    """Runs a test with orjson and with the standard library json module."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr("laissez_faire.engine.orjson", None)
+    return request.param
+
+def test_scorecard_render_json(json_backend):
     """Tests rendering the scorecard as JSON."""
     scenario = {
         "scorecard": {
             "render_type": "json",
             "template": {
                 "player1_score": "{Player1.score}",
-                "player2_score": "{Player2.score}"
+                "player2_score": "{Player2.score}",
+                "leader": "{Player1.name}"
             }
         }
     }
     scorecard = Scorecard(scenario)
-    scorecard.data = {"Player1": {"score": 100}, "Player2": {"score": 50}}
+    scorecard.data = {"Player1": {"score": 100, "name": "Amélie"}, "Player2": {"score": 50}}
     rendered = scorecard.render()
-    assert json.loads(rendered) == {"player1_score": "100", "player2_score": "50"}
+    assert rendered == '{\n  "player1_score": "100",\n  "player2_score": "50",\n  "leader": "Amélie"\n}'
+
+def test_scorecard_render_json_literal_values(json_backend):
+    """
+    Tests that literal template values render the same with either backend.
+    """
+    scenario = {
+        "scorecard": {
+            "render_type": "json",
+            "template": {
+                "count": 3,
+                "ratio": 1.5,
+                "large": 1e16,
+                "tenth": 0.1,
+                "enabled": True,
+                "missing": None,
+                "names": ["Zoë", "日本", "😀"],
+                "nested": {"score": "{Player1.score}"}
+            }
+        }
+    }
+    scorecard = Scorecard(scenario)
+    scorecard.data = {"Player1": {"score": 0.1}}
+    rendered = scorecard.render()
+    assert rendered == (
+        '{\n  "count": 3,\n  "ratio": 1.5,\n  "large": 1e+16,\n  "tenth": 0.1,\n'
+        '  "enabled": true,\n  "missing": null,\n'
+        '  "names": [\n    "Zoë",\n    "日本",\n    "😀"\n  ],\n'
+        '  "nested": {\n    "score": "0.1"\n  }\n}'
+    )
 
 def test_scorecard_update_absolute_score(scenario_template):
     """Tests updating the scorecard with an absolute score type."""
@@ -90,6 +136,15 @@ def test_scorecard_update_absolute_score(scenario_template):
     scorecard.update(new_data)
     assert scorecard.data == {"Player1": {"reputation": 10}}
 
+def test_scorecard_update_mixed_score_types(scenario_template):
+    """Tests one update with calculated, absolute and unknown scores together."""
+    scenario_template["scoring_parameters"]["reputation"] = {"type": "absolute"}
+    scorecard = Scorecard(scenario_template)
+    scorecard.data = {"Player1": {"score": 10, "reputation": 5}}
+    new_data = {"Player1": {"score": 5, "reputation": 2, "unknown": 1}, "Player2": {"reputation": 3}}
+    scorecard.update(new_data)
+    assert scorecard.data == {"Player1": {"score": 15, "reputation": 2}, "Player2": {"reputation": 3}}
+
 def test_scorecard_update_complex_calculation(scenario_template):
     """Tests updating the scorecard with a more complex calculation."""
     scenario_template["scoring_parameters"]["score"] = {
@@ -102,14 +157,6 @@ def test_scorecard_update_complex_calculation(scenario_template):
     scorecard.update(new_data)
     assert scorecard.data == {"Player1": {"score": 15.0}}
 
-def test_scorecard_render_complex_template(scenario_template):
-    """Tests rendering the scorecard with a more complex template."""
-    scenario_template["scorecard"]["template"] = "Scores:\nPlayer1: {Player1.score}\nPlayer2: {Player2.score}\nPlayer1 again: {Player1.score}"
-    scorecard = Scorecard(scenario_template)
-    scorecard.data = {"Player1": {"score": 100}, "Player2": {"score": 50}}
-    rendered = scorecard.render()
-    assert rendered == "Scores:\nPlayer1: 100\nPlayer2: 50\nPlayer1 again: 100"
-
 def test_safe_eval_invalid_expression_variable(scenario_template):
     """Tests that _safe_eval handles an invalid expression."""
     scorecard = Scorecard(scenario_template)
@@ -146,3 +193,58 @@ def test_scorecard_update_error_calculating_score(scenario_template, capsys):
     scorecard.update(new_data)
     captured = capsys.readouterr()
     assert "Error calculating score for score" in captured.out
+
+def test_scorecard_render_conditional_placeholder(scenario_template):
+    """Tests rendering a {{ conditional }} placeholder alongside simple ones."""
+    scenario_template["scorecard"]["template"] = "Player1: {Player1.score} {{ 'top' if Player1['score'] == 100 else 'not top' }}"
+    scorecard = Scorecard(scenario_template)
+    scorecard.data = {"Player1": {"score": 100}}
+    assert scorecard.render() == "Player1: 100 top"
+    scorecard.data = {"Player1": {"score": 50}}
+    assert scorecard.render() == "Player1: 50 not top"
+
+def test_scorecard_calculations_compiled_once(scenario_template):
+    """Tests that calculations are compiled at init and reused by every update."""
+    scenario_template["scoring_parameters"]["reputation"]["calculation"] = "(current_value * 0.5) + llm_judgement"
+    scorecard = Scorecard(scenario_template)
+    scorecard.data = {"Player1": {"score": 10, "reputation": 20}}
+
+    with patch.object(scorecard, "_compile_expression") as mock_compile:
+        scorecard.update({"Player1": {"score": 5, "reputation": 5}})
+        scorecard.update({"Player1": {"score": 5, "reputation": 5}})
+
+    mock_compile.assert_not_called()
+    assert scorecard.data == {"Player1": {"score": 20, "reputation": 12.5}}
+
+def test_scorecard_shared_calculation_compiled_once(scenario_template):
+    """Tests that scores with the same calculation share one compiled calculation."""
+    for config in scenario_template["scoring_parameters"].values():
+        config["calculation"] = "(current_value * 0.5) + llm_judgement"
+    scorecard = Scorecard(scenario_template)
+
+    assert scorecard._calculations["score"] is scorecard._calculations["reputation"]
+    scorecard.update({"Player1": {"score": 5, "reputation": 1}})
+    assert scorecard.data == {"Player1": {"score": 5.0, "reputation": 1.0}}
+
+def test_scorecard_self_contained_calculation_skips_context(scenario_template):
+    """Tests that calculations of only the current value and judgement run without an evaluation context."""
+    scenario_template["scoring_parameters"]["reputation"]["calculation"] = "(current_value * 0.5) + llm_judgement"
+    scenario_template["scoring_parameters"]["score"]["calculation"] = "current_value + llm_judgement * parameters['weight']"
+    scenario_template["parameters"] = {"weight": 2}
+    scorecard = Scorecard(scenario_template)
+    scorecard.data = {"Player1": {"score": 10, "reputation": 20}}
+
+    with patch.object(scorecard, "_eval_context", wraps=scorecard._eval_context) as mock_context:
+        scorecard.update({"Player1": {"score": 5, "reputation": 5}})
+
+    mock_context.assert_called_once()
+    assert scorecard.data == {"Player1": {"score": 20, "reputation": 15.0}}
+
+def test_scorecard_text_renderer_reads_current_data(scenario_template):
+    """Tests that the generated text renderer sees data replaced after init."""
+    scenario_template["scorecard"]["template"] = "{Player1.score} it's {parameters.year}"
+    scenario_template["parameters"] = {"year": 1997}
+    scorecard = Scorecard(scenario_template)
+    assert scorecard.render() == "0 it's 1997"
+    scorecard.data = {"Player1": {"score": 7}}
+    assert scorecard.render() == "7 it's 1997"
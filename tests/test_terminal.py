@@ -66,3 +66,39 @@ def test_display_scores_no_scorecard(mock_console):
     ui.console = mock_console
     ui.display_scores(None)
     mock_console.print.assert_not_called()
+
+def test_terminal_ui_uses_given_console(mock_console):
+    """Tests that the TerminalUI reuses a console it is given."""
+    ui = TerminalUI(console=mock_console)
+    assert ui.console is mock_console
+
+@patch('laissez_faire.terminal.Prompt.ask', return_value="2")
+def test_choose_from_list(mock_ask, mock_console):
+    """Tests that the chosen number is mapped back to its option."""
+    ui = TerminalUI(console=mock_console)
+    assert ui.choose_from_list("Choose a save file", ["a.json", "b.json"]) == "b.json"
+    assert mock_ask.call_args.kwargs["choices"] == ["1", "2"]
+
+@patch('laissez_faire.terminal.Prompt.ask', side_effect=["n", "1"])
+def test_choose_from_list_pages(mock_ask, mock_console):
+    """Tests that long lists are paginated and numbered per page."""
+    ui = TerminalUI(console=mock_console)
+    options = [f"save_{i}.json" for i in range(5)]
+    assert ui.choose_from_list("Choose a save file", options, page_size=3) == "save_3.json"
+    assert mock_ask.call_args_list[0].kwargs["choices"] == ["1", "2", "3", "n"]
+    assert mock_ask.call_args_list[1].kwargs["choices"] == ["1", "2", "n"]
+
+@patch('builtins.input')
+def test_null_terminal_ui_draws_nothing(mock_input, mock_console):
+    """Tests that a null TerminalUI skips all display and waiting."""
+    ui = TerminalUI(console=mock_console, null=True)
+    mock_scorecard = MagicMock(spec=Scorecard)
+
+    ui.display_welcome("Test Scenario")
+    ui.display_scenario_details({"name": "Test Scenario"})
+    ui.display_scores(mock_scorecard)
+    ui.wait_for_turn()
+
+    mock_console.print.assert_not_called()
+    mock_scorecard.render.assert_not_called()
+    mock_input.assert_not_called()